@@ -0,0 +1,286 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Route a question to specialized agents that answer its independent parts concurrently."""
+
+import asyncio
+import json
+import re
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from semantic_kernel import Kernel
+from semantic_kernel.agents import ChatCompletionAgent
+from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
+from semantic_kernel.contents.chat_history import ChatHistory
+from semantic_kernel.contents.chat_message_content import ChatMessageContent
+from semantic_kernel.contents.utils.author_role import AuthorRole
+from semantic_kernel.functions.kernel_arguments import KernelArguments
+
+
+@dataclass
+class Specialist:
+    name: str
+    description: str  # what it answers, as shown to the planner
+    instructions: str
+    functions: list[str] | None  # GitHub plugin functions it may call; None for all of them
+
+
+SPECIALISTS = [
+    Specialist(
+        "issues",
+        "issues and pull requests: listings, details, labels, search, counts",
+        "You answer questions about the issues and pull requests of a GitHub repository.",
+        ["get_issues", "get_issue_detail", "get_issue_details", "query_issues", "search_issues"],
+    ),
+    Specialist(
+        "commits",
+        "commits, diffs, authors, contributors, file history and blame",
+        "You answer questions about the commit history and code changes of a GitHub repository.",
+        [
+            "get_commits",
+            "get_commit_detail",
+            "get_commit_diff",
+            "query_commits",
+            "get_top_committers",
+            "search_commits",
+            "get_file_history",
+            "get_blame",
+        ],
+    ),
+    Specialist(
+        "repository",
+        "repository metadata (description, URL) and the active user's profile",
+        "You answer questions about a GitHub repository's metadata and the active user's profile.",
+        ["get_repository", "get_user_profile"],
+    ),
+]
+
+# Answers questions that cannot be split, with every tool.
+GENERAL = Specialist(
+    "general",
+    "anything else, or a question whose parts depend on each other",
+    "You answer questions about a GitHub repository in a read-only manner.",
+    None,
+)
+
+_PLANNER_INSTRUCTIONS = """Split the user's question about a GitHub repository into independent
+sub-questions, one per specialist:
+{specialists}
+Reply with only a JSON object mapping specialist names to self-contained sub-questions, including
+only the specialists that are needed. If the question cannot be split into independent parts,
+reply {{"general": "<the question>"}}."""
+
+_MERGE_INSTRUCTIONS = (
+    "Combine the answers below into one answer to the user's question. Keep every fact, number and link, "
+    "do not add facts of your own, and do not mention that the answer was assembled from parts."
+)
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+@dataclass
+class Branch:
+    specialist: str
+    question: str
+    answer: str = ""
+    error: str = ""
+    duration_ms: float = 0.0
+
+
+@dataclass
+class FanOutReport:
+    """Timings of a routed turn, and what running its branches one after another would have taken."""
+
+    branches: list[Branch] = field(default_factory=list)
+    plan_ms: float = 0.0
+    fan_out_ms: float = 0.0
+    merge_ms: float = 0.0
+
+    @property
+    def total_ms(self) -> float:
+        return self.plan_ms + self.fan_out_ms + self.merge_ms
+
+    @property
+    def sequential_ms(self) -> float:
+        return self.plan_ms + sum(branch.duration_ms for branch in self.branches) + self.merge_ms
+
+    @property
+    def saved_ms(self) -> float:
+        return self.sequential_ms - self.total_ms
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.branches)} agent{'s' if len(self.branches) != 1 else ''} "
+            f"({', '.join(branch.specialist for branch in self.branches)}): {self.total_ms / 1000:.1f}s "
+            f"instead of {self.sequential_ms / 1000:.1f}s sequentially, {self.saved_ms / 1000:.1f}s saved"
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "branches": [
+                {
+                    "specialist": branch.specialist,
+                    "question": branch.question,
+                    "duration_ms": round(branch.duration_ms, 1),
+                    "error": branch.error,
+                }
+                for branch in self.branches
+            ],
+            "plan_ms": round(self.plan_ms, 1),
+            "fan_out_ms": round(self.fan_out_ms, 1),
+            "merge_ms": round(self.merge_ms, 1),
+            "total_ms": round(self.total_ms, 1),
+            "sequential_ms": round(self.sequential_ms, 1),
+            "saved_ms": round(self.saved_ms, 1),
+        }
+
+
+class AgentRouter:
+    """
+    Answers a question with specialized agents that share one kernel, chat service and plugin.
+
+    A planner call splits the question into independent sub-questions (issues, commits,
+    repository metadata); each goes to an agent whose tools are restricted to its specialty.
+    The agents run concurrently, at most ``max_concurrency`` across every turn using this router,
+    and a final call merges their answers. Questions that cannot be split go to one general agent.
+    """
+
+    def __init__(
+        self,
+        kernel: Kernel,
+        service_id: str,
+        plugin_name: str = "GithubPlugin",
+        specialists: list[Specialist] | None = None,
+        max_concurrency: int = 4,
+    ):
+        self.kernel = kernel
+        self.service_id = service_id
+        self.specialists = {s.name: s for s in (specialists or SPECIALISTS) + [GENERAL]}
+        self.max_concurrency = max_concurrency
+        self._settings = {}
+        for specialist in self.specialists.values():
+            settings = kernel.get_prompt_execution_settings_from_service_id(service_id)
+            filters = None
+            if specialist.functions is not None:
+                filters = {"included_functions": [f"{plugin_name}-{name}" for name in specialist.functions]}
+            settings.function_choice_behavior = FunctionChoiceBehavior.Auto(filters=filters)
+            self._settings[specialist.name] = settings
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+    async def run(
+        self, question: str, history: list[ChatMessageContent] | None = None, context: str = ""
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Answer ``question`` and yield events: ("status", text) as branches start and finish,
+        ("text", chunk) for the answer, and finally ("report", FanOutReport).
+
+        Args:
+            question: The user's question.
+            history: Earlier messages, so follow-up questions are planned as self-contained ones.
+            context: Appended to every agent's instructions, e.g. the repository name and date.
+        """
+        report = FanOutReport()
+        started = time.perf_counter()
+        plan = await self.plan(question, history or [])
+        report.plan_ms = (time.perf_counter() - started) * 1000
+        report.branches = [Branch(name, sub_question) for name, sub_question in plan]
+        yield ("status", f"🔀 Asking {', '.join(branch.specialist for branch in report.branches)}...")
+
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(self._answer(branch, context)) for branch in report.branches]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                branch = await finished
+                yield ("status", f"{'⚠️' if branch.error else '✅'} {branch.specialist} answered")
+        finally:
+            for task in tasks:
+                task.cancel()
+        report.fan_out_ms = (time.perf_counter() - started) * 1000
+
+        if len(report.branches) == 1 and not report.branches[0].error:
+            yield ("text", report.branches[0].answer)
+        else:
+            started = time.perf_counter()
+            async for chunk in self._merge(question, report.branches):
+                yield ("text", chunk)
+            report.merge_ms = (time.perf_counter() - started) * 1000
+        yield ("report", report)
+
+    async def answer(self, question: str, history: list[ChatMessageContent] | None = None, context: str = ""):
+        """The merged answer and the :class:`FanOutReport` of a question."""
+        chunks, report = [], None
+        async for kind, value in self.run(question, history, context):
+            if kind == "text":
+                chunks.append(value)
+            elif kind == "report":
+                report = value
+        return "".join(chunks), report
+
+    async def plan(self, question: str, history: list[ChatMessageContent]) -> list[tuple[str, str]]:
+        """(specialist, sub-question) pairs for a question; one general branch if it cannot be split."""
+        specialists = "\n".join(
+            f"- {s.name}: {s.description}" for s in self.specialists.values() if s.name != GENERAL.name
+        )
+        chat = ChatHistory(system_message=_PLANNER_INSTRUCTIONS.format(specialists=specialists))
+        for message in history[-6:]:
+            if message.role in (AuthorRole.USER, AuthorRole.ASSISTANT) and message.content:
+                chat.add_message(ChatMessageContent(role=message.role, content=message.content))
+        chat.add_user_message(question)
+        service = self.kernel.get_service(self.service_id)
+        settings = self.kernel.get_prompt_execution_settings_from_service_id(self.service_id)
+        response = await service.get_chat_message_content(chat, settings)
+        match = _JSON_OBJECT.search(str(response.content) if response else "")
+        try:
+            plan = json.loads(match.group(0)) if match else {}
+        except json.JSONDecodeError:
+            plan = {}
+        branches = [
+            (name, sub_question.strip())
+            for name, sub_question in plan.items()
+            if name in self.specialists and isinstance(sub_question, str) and sub_question.strip()
+        ]
+        if not branches or any(name == GENERAL.name for name, _ in branches):
+            return [(GENERAL.name, question)]
+        return branches
+
+    async def _answer(self, branch: Branch, context: str) -> Branch:
+        specialist = self.specialists[branch.specialist]
+        agent = ChatCompletionAgent(
+            kernel=self.kernel,
+            name=f"{specialist.name.title()}Agent",
+            instructions=f"{specialist.instructions}\n{context}".strip(),
+            arguments=KernelArguments(settings=self._settings[specialist.name]),
+        )
+        async with self._get_semaphore():
+            # Timed once admitted, so the sequential estimate excludes time spent queuing.
+            started = time.perf_counter()
+            try:
+                response = await agent.get_response(messages=branch.question)
+                branch.answer = str(response.content)
+            except Exception as exc:
+                branch.error = str(exc) or type(exc).__name__
+            branch.duration_ms = (time.perf_counter() - started) * 1000
+        return branch
+
+    async def _merge(self, question: str, branches: list[Branch]) -> AsyncIterator[str]:
+        parts = [
+            f"### {branch.question}\n{branch.answer or f'(could not be answered: {branch.error})'}"
+            for branch in branches
+        ]
+        chat = ChatHistory(system_message=_MERGE_INSTRUCTIONS)
+        chat.add_user_message(f"Question: {question}\n\n" + "\n\n".join(parts))
+        service = self.kernel.get_service(self.service_id)
+        settings = self.kernel.get_prompt_execution_settings_from_service_id(self.service_id)
+        async for chunk in service.get_streaming_chat_message_content(chat, settings):
+            if chunk is not None and chunk.content:
+                yield chunk.content
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
@@ -0,0 +1,191 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Answer-level cache in front of the agent, invalidated when the GitHub data behind an answer changes."""
+
+import asyncio
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+
+from git_plugin import GitHubPlugin
+
+_WORD = re.compile(r"[a-z0-9#_./-]+")
+_QUOTED = re.compile(r'"([^"]+)"|`([^`]+)`')
+_SHA = re.compile(r"(?=[a-f]*\d)[0-9a-f]{7,40}")
+_STATE_WORDS = frozenset(
+    {"open", "opened", "closed", "merged", "unmerged", "draft", "reopened", "all", "not", "unassigned"}
+)
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(_WORD.findall(question.lower()))
+
+
+def key_terms(question: str) -> frozenset[str]:
+    """
+    The tokens that change what a question asks about even when the rest of it is the same:
+    issue numbers and other numbers, commit SHAs, state words and quoted terms.
+    """
+    quoted = (" ".join(text.lower().split()) for match in _QUOTED.findall(question) for text in match if text)
+    terms = {f'"{text}"' for text in quoted}
+    for word in normalize_question(question).split():
+        token = word.strip("./-")
+        if token.lstrip("#").isdigit():
+            terms.add(token.lstrip("#"))
+        elif token in _STATE_WORDS or _SHA.fullmatch(token):
+            terms.add(token)
+    return frozenset(terms)
+
+
+def similarity(a: Counter, b: Counter) -> float:
+    """Cosine similarity of two bags of words."""
+    dot = sum(count * b[word] for word, count in a.items())
+    norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+    return dot / norm if norm else 0.0
+
+
+@dataclass
+class CachedAnswer:
+    repo: str
+    context: str
+    question: str
+    words: Counter
+    terms: frozenset[str]
+    answer: str
+    # (path, ETag or Last-Modified) of every GitHub resource the agent read to produce the answer.
+    dependencies: list[tuple[str, str]]
+    stored_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class AnswerCacheStats:
+    hits: int = 0
+    near_hits: int = 0
+    misses: int = 0
+    invalidated: int = 0
+    stores: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.near_hits + self.misses + self.invalidated
+        return (self.hits + self.near_hits) / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "invalidated": self.invalidated,
+            "stores": self.stores,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class AnswerCache:
+    """
+    Maps (repository, conversation context, question) to a previous answer.
+
+    Questions are compared after normalization, and a question whose bag-of-words cosine
+    similarity to a cached one reaches ``similarity_threshold`` counts as the same question,
+    provided both name the same numbers, SHAs, states and quoted terms (see :func:`key_terms`).
+    Before a cached answer is served, every GitHub resource it was built from is revalidated
+    through the plugin (a conditional request, free of rate limit); if any ETag changed, the
+    entry is dropped. Entries also expire after ``ttl`` seconds and are evicted LRU-first.
+
+    Args:
+        ttl: Maximum age of an answer in seconds.
+        max_entries: Number of answers kept.
+        similarity_threshold: Minimum cosine similarity for a near-duplicate match.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 256, similarity_threshold: float = 0.9):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.stats = AnswerCacheStats()
+        self._entries: OrderedDict[tuple[str, str, str], CachedAnswer] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _find(self, repo: str, context: str, question: str) -> tuple[CachedAnswer | None, bool]:
+        key = (repo.lower(), context, normalize_question(question))
+        terms = key_terms(question)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry, True
+            words = Counter(key[2].split())
+            best, best_score = None, self.similarity_threshold
+            for candidate in self._entries.values():
+                # "issue #42" and "issue #43" are near-identical bags of words but different questions.
+                if candidate.repo == key[0] and candidate.context == key[1] and candidate.terms == terms:
+                    score = similarity(words, candidate.words)
+                    if score >= best_score:
+                        best, best_score = candidate, score
+            if best is not None:
+                self._entries.move_to_end((best.repo, best.context, best.question))
+            return best, False
+
+    async def lookup(self, plugin: GitHubPlugin, repo: str, context: str, question: str) -> str | None:
+        """Return a cached answer that is still current, or ``None``."""
+        entry, exact = self._find(repo, context, question)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if time.time() - entry.stored_at > self.ttl or not await self._is_current(plugin, entry):
+            self._discard(entry)
+            self.stats.invalidated += 1
+            return None
+        if exact:
+            self.stats.hits += 1
+        else:
+            self.stats.near_hits += 1
+        return entry.answer
+
+    def store(
+        self, repo: str, context: str, question: str, answer: str, dependencies: list[tuple[str, str | None]]
+    ) -> bool:
+        """
+        Cache an answer. Answers that read nothing from GitHub, read a resource without a
+        validator (the local index or mirror), or performed a write cannot be revalidated and
+        are not stored.
+        """
+        if not answer or not dependencies or any(version is None for _, version in dependencies):
+            return False
+        normalized = normalize_question(question)
+        entry = CachedAnswer(
+            repo=repo.lower(),
+            context=context,
+            question=normalized,
+            words=Counter(normalized.split()),
+            terms=key_terms(question),
+            answer=answer,
+            dependencies=sorted(set(dependencies)),
+        )
+        with self._lock:
+            self._entries[(entry.repo, context, normalized)] = entry
+            self._entries.move_to_end((entry.repo, context, normalized))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self.stats.stores += 1
+        return True
+
+    def invalidate_repo(self, repo: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == repo.lower()]:
+                del self._entries[key]
+
+    def _discard(self, entry: CachedAnswer) -> None:
+        with self._lock:
+            self._entries.pop((entry.repo, entry.context, entry.question), None)
+
+    @staticmethod
+    async def _is_current(plugin: GitHubPlugin, entry: CachedAnswer) -> bool:
+        try:
+            versions = await asyncio.gather(*(plugin.resource_version(path) for path, _ in entry.dependencies))
+        except Exception:
+            return False
+        return all(current == version for current, (_, version) in zip(versions, entry.dependencies))
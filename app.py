@@ -1,44 +1,251 @@
 import os
 import streamlit as st
 from dotenv import load_dotenv
-from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
-from semantic_kernel.contents.chat_history import ChatHistory
-from semantic_kernel import Kernel
-from semantic_kernel.agents import ChatCompletionAgent
-from semantic_kernel.functions.kernel_arguments import KernelArguments
-from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
-from semantic_kernel.contents.utils.author_role import AuthorRole
-from semantic_kernel.contents.chat_message_content import ChatMessageContent
+from contextvars import ContextVar
 from datetime import datetime
 import asyncio
+import hashlib
+import atexit
+import threading
+import time
 
-from git_plugin import GitHubPlugin, GitHubSettings
+# semantic_kernel (and git_plugin, which depends on it) take seconds to import, so they are
+# imported inside the functions below; the page shell renders before the first import.
 
 # Load environment variables
 if os.path.exists(".env"):
     load_dotenv(override=True)
 
-def get_kernel(repo_name):
+# Tracing is on unless TELEMETRY_ENABLED=false; Semantic Kernel reads this flag at import time to
+# record chat completion spans with token usage.
+TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "true").lower() in ("1", "true", "yes")
+if TELEMETRY_ENABLED:
+    os.environ.setdefault("SEMANTICKERNEL_EXPERIMENTAL_GENAI_ENABLE_OTEL_DIAGNOSTICS", "true")
+
+@st.cache_resource
+def get_event_loop():
+    # One long-running loop per process: pooled HTTP clients are bound to the loop that
+    # opened them, while Streamlit starts a fresh asyncio.run() on every rerun.
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agent-io-loop", daemon=True).start()
+    return loop
+
+async def run_on_shared_loop(coro):
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    return await asyncio.wrap_future(future)
+
+async def iterate_on_shared_loop(agen):
+    async def next_item():
+        return await agen.__anext__()
+    while True:
+        try:
+            yield await run_on_shared_loop(next_item())
+        except StopAsyncIteration:
+            break
+
+# Streaming UI updates are batched: at most one re-render per interval unless this many characters are pending.
+RENDER_INTERVAL_SECONDS = 0.1
+RENDER_MAX_PENDING_CHARS = 200
+
+# Per-turn callback for tool-call progress; a ContextVar because the kernel and its filter are shared by all sessions.
+tool_progress = ContextVar("tool_progress", default=None)
+
+async def report_tool_progress(context, next):
+    notify = tool_progress.get()
+    if notify is not None:
+        await notify(f"🔧 Running `{context.function.name}`...")
+    await next(context)
+
+async def stream_turn(agent, messages, versions=None, collector=None, router=None, repo_context=""):
+    # Runs on the shared loop: yields ("status", text) for tool calls as they start and ("text", chunk) for tokens.
+    # If given, `versions` collects the (path, ETag) of every GitHub resource the turn read, and with a
+    # telemetry collector the turn ends with a ("waterfall", rows) event.
+    # With a router the question goes to concurrent specialist agents instead, ending with a ("report", report) event.
+    from git_plugin import resource_versions
+    from telemetry import TURN_SPAN, tracer
+
+    queue = asyncio.Queue()
+    trace_ids = []
+
+    async def produce():
+        tool_progress.set(lambda status: queue.put(("status", status)))
+        if versions is not None:
+            resource_versions.set(versions)
+        try:
+            with tracer.start_as_current_span(TURN_SPAN) as span:
+                if collector is not None:
+                    trace_ids.append(span.get_span_context().trace_id)
+                    collector.watch(trace_ids[0])
+                if router is not None:
+                    async for event in router.run(str(messages[-1].content), messages[:-1], repo_context):
+                        await queue.put(event)
+                else:
+                    async for response in agent.invoke_stream(messages=messages):
+                        if response.message.content:
+                            await queue.put(("text", response.message.content))
+        finally:
+            await queue.put(None)
+
+    task = asyncio.ensure_future(produce())
+    try:
+        while (event := await queue.get()) is not None:
+            yield event
+        await task
+        if trace_ids:
+            yield ("waterfall", collector.waterfall(trace_ids[0]))
+    finally:
+        task.cancel()
+        if trace_ids:
+            # A turn that raised (or was abandoned) never reached its waterfall; stop collecting its spans.
+            collector.unwatch(trace_ids[0])
+
+@st.cache_resource
+def get_telemetry():
+    # Span collector feeding the metrics and the per-turn waterfall; METRICS_PORT also serves them at /metrics.
+    if not TELEMETRY_ENABLED:
+        return None
+    from telemetry import configure_telemetry, serve_metrics
+
+    collector = configure_telemetry(console=os.getenv("OTEL_CONSOLE_EXPORT", "false").lower() == "true")
+    if os.getenv("METRICS_PORT"):
+        serve_metrics(collector.metrics, int(os.getenv("METRICS_PORT")))
+    return collector
+
+@st.cache_resource
+def get_github_plugin():
+    from git_plugin import GitHubPlugin, GitHubSettings
+
+    # Shared by every session so all tool calls reuse the same keep-alive connection pool.
+    # GITHUB_CACHE_PATH adds an SQLite response cache shared by all worker processes, pruned to GITHUB_CACHE_MAX_MB.
+    # GIT_BACKEND picks where commits, diffs and blame come from: "api", "mirror" (a local clone) or "auto".
+    gh_settings = GitHubSettings(
+        token=os.getenv("GITHUB_PAT"),
+        cache_path=os.getenv("GITHUB_CACHE_PATH") or None,
+        cache_disk_max_bytes=int(os.getenv("GITHUB_CACHE_MAX_MB", "256")) * 1024 * 1024,
+        git_backend=os.getenv("GIT_BACKEND", "auto"),
+        mirror_dir=os.getenv("GIT_MIRROR_DIR", ".github-mirrors"),
+        warmup_indexes=os.getenv("WARMUP_INDEXES", "false").lower() in ("1", "true", "yes"),
+    )
+    plugin = GitHubPlugin(gh_settings)
+    loop = get_event_loop()
+    asyncio.run_coroutine_threadsafe(plugin.start(), loop).result()
+    atexit.register(lambda: asyncio.run_coroutine_threadsafe(plugin.aclose(), loop).result(timeout=5))
+    return plugin
+
+@st.cache_resource
+def get_webhook_server():
+    # With GITHUB_WEBHOOK_SECRET set, GitHub webhooks posted to http://<WEBHOOK_HOST>:<WEBHOOK_PORT>/webhook
+    # keep the plugin's cache and indexes current, so covered repositories are not re-polled.
+    secret = os.getenv("GITHUB_WEBHOOK_SECRET")
+    if not secret:
+        return None
+    from webhooks import WebhookProcessor, WebhookServer
+
+    server = WebhookServer(
+        WebhookProcessor(get_github_plugin()),
+        secret,
+        get_event_loop(),
+        host=os.getenv("WEBHOOK_HOST", "127.0.0.1"),
+        port=int(os.getenv("WEBHOOK_PORT", "8787")),
+    ).start()
+    atexit.register(server.stop)
+    return server
+
+SERVICE_ID = "serv-git-chat-1"
+
+@st.cache_resource
+def get_shared_kernel():
+    # The chat service, its HTTP pool and the plugin are session independent: build them once per process.
+    from semantic_kernel import Kernel
+    from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+
     kernel = Kernel()
-    service_id = "serv-git-chat-1"
     kernel.add_service(AzureChatCompletion(
         endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
         api_key=os.getenv("AZURE_OPENAI_API_KEY"),
         deployment_name=os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME"),
         api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-        service_id=service_id
+        service_id=SERVICE_ID
     ))
-    settings = kernel.get_prompt_execution_settings_from_service_id(service_id=service_id)
+    kernel.add_plugin(plugin=get_github_plugin(), plugin_name="GithubPlugin")
+    kernel.add_filter("auto_function_invocation", report_tool_progress)
+    return kernel
+
+@st.cache_resource
+def get_history_reducer():
+    # CHAT_HISTORY_REDUCER selects the strategy ("summarize", "truncate" or "none") so they can be compared.
+    # CHAT_HISTORY_SUMMARIZE_EVERY batches summaries, so most turns make no summarization call.
+    from history_reducer import create_reducer
+
+    return create_reducer(
+        os.getenv("CHAT_HISTORY_REDUCER", "summarize"),
+        service=get_shared_kernel().get_service(SERVICE_ID),
+        keep_turns=int(os.getenv("CHAT_HISTORY_KEEP_TURNS", "6")),
+        max_tokens=int(os.getenv("CHAT_HISTORY_MAX_TOKENS", "6000")),
+        summarize_every=int(os.getenv("CHAT_HISTORY_SUMMARIZE_EVERY", "4")),
+    )
+
+@st.cache_resource
+def get_answer_cache():
+    # Opt-in: ANSWER_CACHE_ENABLED=true reuses answers across sessions while the GitHub data behind them is unchanged.
+    if os.getenv("ANSWER_CACHE_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return None
+    from answer_cache import AnswerCache
+
+    return AnswerCache(
+        ttl=float(os.getenv("ANSWER_CACHE_TTL", "3600")),
+        max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "256")),
+        similarity_threshold=float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.9")),
+    )
+
+@st.cache_resource
+def get_agent_router():
+    # Opt-in: AGENT_ROUTING=true splits questions across issue, commit and repository agents that run concurrently.
+    if os.getenv("AGENT_ROUTING", "false").lower() not in ("1", "true", "yes"):
+        return None
+    from agent_router import AgentRouter
+
+    return AgentRouter(get_shared_kernel(), SERVICE_ID, max_concurrency=int(os.getenv("AGENT_MAX_CONCURRENCY", "4")))
+
+def conversation_context(messages):
+    # Follow-up questions depend on the previous answer, so it is part of the answer cache key.
+    previous = next((m["content"] for m in reversed(messages) if m["role"] == "assistant"), "")
+    return hashlib.sha256(previous.encode()).hexdigest()[:16] if previous else ""
+
+def start_warmup(repo_name):
+    # Prefetch what the first question usually needs while it is being typed; a newer repo cancels the old warmup.
+    previous = st.session_state.get("warmup")
+    if previous is not None:
+        previous.cancel()
+    st.session_state.warmup = None
+    organization, _, repo = repo_name.strip().partition("/")
+    if organization and repo and os.getenv("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes"):
+        st.session_state.warmup = asyncio.run_coroutine_threadsafe(
+            get_github_plugin().warm_up(organization, repo), get_event_loop()
+        )
+
+def repo_instructions(repo_name):
+    # The per-session part of every agent's instructions.
+    return (
+        "Use the values from arguments:\n"
+        f"- The repository name: {repo_name}\n"
+        f"- The current datetime: {datetime.now()}\n"
+    )
+
+def get_kernel(repo_name):
+    # Per session only the repo-specific instructions are new; the agent wraps the shared kernel.
+    from semantic_kernel.agents import ChatCompletionAgent
+    from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
+    from semantic_kernel.functions.kernel_arguments import KernelArguments
+
+    kernel = get_shared_kernel()
+    settings = kernel.get_prompt_execution_settings_from_service_id(service_id=SERVICE_ID)
     settings.function_choice_behavior = FunctionChoiceBehavior.Auto()
-    gh_settings = GitHubSettings(token=os.getenv("GITHUB_PAT"))
-    kernel.add_plugin(plugin=GitHubPlugin(gh_settings), plugin_name="GithubPlugin")
     inst_template = (
         "You are an agent designed to query and retrieve information from a single GitHub repository in a read-only manner.\n"
         "You are also able to access the profile of the active user.\n"
         "Use the current date and time to provide up-to-date details or time-sensitive responses.\n"
-        "Use the values from arguments:\n"
-        f"- The repository name: {repo_name}\n"
-        f"- The current datetime: {datetime.now()}\n"
+        + repo_instructions(repo_name)
     )
     agent = ChatCompletionAgent(
         kernel=kernel,
@@ -51,6 +258,11 @@ def get_kernel(repo_name):
 async def main():
     st.set_page_config(page_title="GitHub Chat Agent", layout="centered")
     st.title("🤖 GitHub Chat Agent")
+    get_webhook_server()
+
+    from semantic_kernel.contents.chat_history import ChatHistory
+    from semantic_kernel.contents.chat_message_content import ChatMessageContent
+    from semantic_kernel.contents.utils.author_role import AuthorRole
 
     # Sidebar navigation
     with st.sidebar:
@@ -58,6 +270,7 @@ async def main():
             repo_name = st.text_input("Repository (owner/repo):", st.session_state.get("repo_name", "harsha3187/git-dev-agent"))
             if repo_name != st.session_state.get("repo_name", ""):
                 st.session_state.repo_name = repo_name
+                start_warmup(repo_name)
                 st.session_state.agent = get_kernel(repo_name)
                 st.session_state.chat_history = ChatHistory()  # Reset chat on repo change
                 if "messages" not in st.session_state:
@@ -70,6 +283,17 @@ async def main():
                         ChatMessageContent(role=AuthorRole.SYSTEM, content=repo_change_msg)
                     )
 
+        answer_cache = get_answer_cache()
+        if answer_cache is not None:
+            stats = answer_cache.stats
+            st.caption(f"Answer cache: {stats.hits + stats.near_hits} hits, hit rate {stats.hit_rate:.0%}")
+
+        collector = get_telemetry()
+        show_debug = collector is not None and st.checkbox("Show debug panel", key="show_debug")
+        if show_debug:
+            with st.expander("📈 Metrics"):
+                st.code(collector.metrics.render(), language="text")
+
         # Navigation buttons
         page = st.radio(
             "Navigation",
@@ -104,6 +328,7 @@ async def main():
 
         # Accept user input and stream assistant response
         if prompt:
+            context = conversation_context(st.session_state.messages)
             # Add user message to chat history and display
             st.session_state.messages.append({"role": "user", "content": prompt})
             st.session_state.chat_history.add_message(
@@ -116,16 +341,77 @@ async def main():
             # Stream assistant response
             with chat_placeholder:
                 with st.chat_message("assistant"):
-                    response_text = ""
+                    started = time.perf_counter()
+                    status_container = st.empty()
                     response_container = st.empty()
-                    with st.spinner("Thinking..."):
-                        async def get_stream():
-                            async for response in st.session_state.agent.invoke(messages=st.session_state.chat_history):
-                                yield response.content
-                        response_stream = get_stream()
-                        async for chunk in response_stream:
-                            response_text += str(chunk)
-                            response_container.markdown(response_text)
+                    status_container.caption("Thinking...")
+                    response_text = None
+                    if answer_cache is not None:
+                        response_text = await run_on_shared_loop(answer_cache.lookup(
+                            get_github_plugin(), st.session_state.repo_name, context, prompt
+                        ))
+                    if response_text is not None:
+                        response_container.markdown(response_text)
+                        status_container.empty()
+                        st.caption(f"Answered from cache in {time.perf_counter() - started:.2f}s")
+                    else:
+                        # Bound what is resent every turn; the reduced history (with its summary) carries forward.
+                        st.session_state.chat_history = await run_on_shared_loop(
+                            get_history_reducer().reduce(st.session_state.chat_history)
+                        )
+                        chunks, pending, last_render, first_token_at, versions, waterfall = [], 0, 0.0, None, [], []
+                        fan_out = None
+                        events = stream_turn(
+                            st.session_state.agent,
+                            st.session_state.chat_history.messages,
+                            versions,
+                            collector,
+                            router=get_agent_router(),
+                            repo_context=repo_instructions(st.session_state.repo_name),
+                        )
+                        async for kind, text in iterate_on_shared_loop(events):
+                            if kind == "waterfall":
+                                waterfall = text
+                                continue
+                            if kind == "report":
+                                fan_out = text
+                                continue
+                            if kind == "status":
+                                status_container.caption(text)
+                                continue
+                            if first_token_at is None:
+                                first_token_at = time.perf_counter()
+                                status_container.empty()
+                            chunks.append(text)
+                            pending += len(text)
+                            now = time.perf_counter()
+                            if now - last_render >= RENDER_INTERVAL_SECONDS or pending >= RENDER_MAX_PENDING_CHARS:
+                                response_container.markdown("".join(chunks) + "▌")
+                                pending, last_render = 0, now
+                        response_text = "".join(chunks)
+                        response_container.markdown(response_text)
+                        status_container.empty()
+                        if first_token_at is not None:
+                            from telemetry import format_waterfall, turn_usage
+
+                            usage = turn_usage(waterfall)
+                            st.session_state.setdefault("turn_timings", []).append({
+                                "time_to_first_token": first_token_at - started,
+                                "total": time.perf_counter() - started,
+                                **usage,
+                                **({"fan_out": fan_out.as_dict()} if fan_out else {}),
+                            })
+                            st.caption(
+                                f"First token after {first_token_at - started:.2f}s"
+                                + (f" · {usage['input_tokens']} in / {usage['output_tokens']} out tokens" if waterfall else "")
+                            )
+                            if fan_out is not None:
+                                st.caption(f"🔀 {fan_out.summary()}")
+                            if show_debug and waterfall:
+                                with st.expander("⏱️ Turn waterfall"):
+                                    st.code(format_waterfall(waterfall), language="text")
+                        if answer_cache is not None:
+                            answer_cache.store(st.session_state.repo_name, context, prompt, response_text, versions)
                     st.session_state.chat_history.add_message(
                         ChatMessageContent(role=AuthorRole.ASSISTANT, content=response_text)
                     )
@@ -133,25 +419,61 @@ async def main():
 
     elif page == "Create GitHub Issue":
         st.header("🐞 Create GitHub Issue")
+        organization, _, repo = st.session_state.repo_name.strip().partition("/")
+        plugin = get_github_plugin()
         with st.form("issue_form"):
             issue_title = st.text_input("Issue Title")
             issue_desc = st.text_area("Issue Description")
             issue_labels = st.text_input("Labels (comma separated)")
             submit_issue = st.form_submit_button("Create Issue")
             if submit_issue and issue_title and issue_desc:
-                gh_settings = GitHubSettings(token=os.getenv("GITHUB_PAT"))
-                plugin = GitHubPlugin(gh_settings)
                 labels = [l.strip() for l in issue_labels.split(",") if l.strip()]
-                result = plugin.create_issue(
-                    repo=st.session_state.repo_name,
-                    title=issue_title,
-                    body=issue_desc,
-                    labels=labels
-                )
-                if result.get("html_url"):
+                try:
+                    result = await run_on_shared_loop(
+                        plugin.create_issue(organization, repo, issue_title, issue_desc, labels)
+                    )
                     st.success(f"Issue created: [View Issue]({result['html_url']})")
+                except Exception as e:
+                    st.error(f"Failed to create issue: {e}")
+
+        st.subheader("📥 Bulk create from CSV/JSON")
+        st.caption(
+            "CSV columns: title, body (or description), labels (comma or semicolon separated), optional id. "
+            "Issues whose title already exists are skipped, so a failed upload can simply be run again."
+        )
+        upload = st.file_uploader("Triage export", type=["csv", "json"])
+        if upload is not None:
+            from bulk_issues import BulkIssueCreator, parse_drafts
+
+            try:
+                drafts = parse_drafts(upload.getvalue(), upload.name)
+            except ValueError as e:
+                st.error(f"Could not read {upload.name}: {e}")
+                drafts = []
+            if drafts:
+                st.dataframe([d.model_dump(exclude={"fingerprint"}) for d in drafts], use_container_width=True)
+            if drafts and st.button(f"Create {len(drafts)} issues in {st.session_state.repo_name}"):
+                progress = st.progress(0.0, text="Checking for existing issues...")
+                table = st.empty()
+                rows = []
+                # Results stream in as each issue is created; the shared loop keeps the pooled client.
+                results = BulkIssueCreator(plugin).run(organization, repo, drafts)
+                async for result in iterate_on_shared_loop(results):
+                    rows.append({
+                        "row": result.index + 1,
+                        "title": result.title,
+                        "status": result.status,
+                        "issue": result.url or "",
+                        "detail": result.detail,
+                    })
+                    progress.progress(len(rows) / len(drafts), text=f"{len(rows)}/{len(drafts)} processed")
+                    table.dataframe(sorted(rows, key=lambda r: r["row"]), use_container_width=True)
+                counts = {status: sum(r["status"] == status for r in rows) for status in ("created", "duplicate", "failed")}
+                summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+                if counts["failed"]:
+                    st.warning(f"{summary}. Upload the same file again to retry the failed issues.")
                 else:
-                    st.error("Failed to create issue.")
+                    st.success(summary)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,223 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""
+Microbenchmark of decoding one page of ``GET /repos/{owner}/{repo}/issues`` into ``Issue`` models.
+
+    python -m benchmarks.decode
+    python -m benchmarks.decode --items 100 --body-bytes 8000 --iterations 300
+
+Compares the dict path (``json.loads`` and ``Issue(**item)`` per element), the same path with
+orjson, and ``ISSUE_PAGE.validate_json`` on the raw bytes. CPU time is ``time.process_time``
+per page; peak RSS is the growth of the resident high-water mark while a fresh interpreter
+decodes one page, so memory freed by earlier runs cannot hide the intermediate objects
+(Linux only; reported as -1 elsewhere).
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from git_plugin import ISSUE_PAGE, Issue
+
+
+def _dict_json(body: bytes) -> list[Issue]:
+    return [Issue(**item) for item in json.loads(body)]
+
+
+def _dict_orjson(body: bytes) -> list[Issue]:
+    import orjson
+
+    return [Issue(**item) for item in orjson.loads(body)]
+
+
+def _typed(body: bytes) -> list[Issue]:
+    return ISSUE_PAGE.validate_json(body)
+
+
+DECODERS: dict[str, Callable[[bytes], list[Issue]]] = {
+    "dict (json)": _dict_json,
+    "dict (orjson)": _dict_orjson,
+    "typed": _typed,
+}
+
+
+def _user(rng: random.Random) -> dict:
+    login = f"user{rng.randint(1, 400)}"
+    url = f"https://api.github.com/users/{login}"
+    return {
+        "login": login,
+        "id": rng.randint(1, 10**7),
+        "node_id": f"MDQ6VXNlcj{rng.randint(1, 10**7)}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{rng.randint(1, 10**7)}?v=4",
+        "gravatar_id": "",
+        "url": url,
+        "html_url": f"https://github.com/{login}",
+        "followers_url": f"{url}/followers",
+        "following_url": f"{url}/following{{/other_user}}",
+        "gists_url": f"{url}/gists{{/gist_id}}",
+        "starred_url": f"{url}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"{url}/subscriptions",
+        "organizations_url": f"{url}/orgs",
+        "repos_url": f"{url}/repos",
+        "events_url": f"{url}/events{{/privacy}}",
+        "received_events_url": f"{url}/received_events",
+        "type": "User",
+        "site_admin": False,
+    }
+
+
+def issue_page(items: int, body_bytes: int, seed: int = 7) -> bytes:
+    """A list-issues response with every field GitHub returns, most of which ``Issue`` does not model."""
+    rng = random.Random(seed)
+    words = "cache latency token retry crash timeout login render index search commit branch label".split()
+    api = "https://api.github.com/repos/octo-org/octo-repo"
+    page = []
+    for number in range(1, items + 1):
+        text = ""
+        while len(text) < body_bytes:
+            text += " ".join(rng.choices(words, k=12)) + ".\n"
+        labels = [
+            {
+                "id": index,
+                "node_id": f"LA_kwDO{index}",
+                "url": f"{api}/labels/{name}",
+                "name": name,
+                "color": "d73a4a",
+                "default": index == 1,
+                "description": f"{name.title()} label",
+            }
+            for index, name in enumerate(rng.sample(["bug", "enhancement", "documentation", "performance"], 2), 1)
+        ]
+        page.append({
+            "url": f"{api}/issues/{number}",
+            "repository_url": api,
+            "labels_url": f"{api}/issues/{number}/labels{{/name}}",
+            "comments_url": f"{api}/issues/{number}/comments",
+            "events_url": f"{api}/issues/{number}/events",
+            "html_url": f"https://github.com/octo-org/octo-repo/issues/{number}",
+            "id": 100000 + number,
+            "node_id": f"I_kwDO{number}",
+            "number": number,
+            "title": " ".join(rng.sample(words, 5)).capitalize(),
+            "user": _user(rng),
+            "labels": labels,
+            "state": "open",
+            "locked": False,
+            "assignee": (assignee := _user(rng)),
+            "assignees": [assignee, _user(rng)],
+            "milestone": None,
+            "comments": rng.randint(0, 40),
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-02-01T00:00:00Z",
+            "closed_at": None,
+            "author_association": "CONTRIBUTOR",
+            "active_lock_reason": None,
+            "body": text,
+            "reactions": {
+                "url": f"{api}/issues/{number}/reactions",
+                "total_count": 3,
+                **{key: rng.randint(0, 3) for key in ("+1", "-1", "laugh", "hooray", "confused", "heart", "rocket", "eyes")},
+            },
+            "timeline_url": f"{api}/issues/{number}/timeline",
+            "performed_via_github_app": None,
+            "state_reason": None,
+        })
+    return json.dumps(page).encode()
+
+
+def cpu_ms_per_page(decode: Callable[[bytes], list[Issue]], body: bytes, iterations: int) -> float:
+    decode(body)  # warm up
+    started = time.process_time()
+    for _ in range(iterations):
+        decode(body)
+    return (time.process_time() - started) / iterations * 1000
+
+
+def traced_peak_kib(decode: Callable[[bytes], list[Issue]], body: bytes) -> float:
+    """Peak memory allocated through Python's allocator while decoding one page."""
+    tracemalloc.start()
+    try:
+        decode(body)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def rss_growth_kib(name: str, body_path: str) -> int:
+    """Growth of peak RSS while a fresh interpreter decodes the page at ``body_path`` with ``name``."""
+    if not os.path.exists("/proc/self/clear_refs"):
+        return -1
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.decode", "--rss-child", name, body_path],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return int(output.strip().splitlines()[-1])
+
+
+def _peak_rss_kib() -> int:
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+
+
+def _rss_child(name: str, body_path: str) -> None:
+    with open(body_path, "rb") as f:
+        body = f.read()
+    decode = DECODERS[name]
+    # Import and build the decoder's lazily created state before the baseline is taken.
+    decode(b"[]")
+    # Importing the kernel peaks far above the steady state; reset the high-water mark (Linux only).
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    before = _peak_rss_kib()
+    models = decode(body)
+    after = _peak_rss_kib()
+    assert len(models) > 0
+    print(after - before)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="issues per page")
+    parser.add_argument("--body-bytes", type=int, default=4000, help="approximate size of each issue body")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--rss-child", nargs=2, metavar=("DECODER", "BODY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.rss_child:
+        _rss_child(*args.rss_child)
+        return 0
+
+    names = [name for name in DECODERS if "orjson" not in name or importlib.util.find_spec("orjson")]
+    body = issue_page(args.items, args.body_bytes)
+    expected = _dict_json(body)
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        f.write(body)
+    try:
+        print(f"{args.items} issues, {len(body) / 1024:.0f} KiB page")
+        print(f"{'decoder':<16}{'cpu_ms':>10}{'alloc_peak_kib':>16}{'rss_growth_kib':>16}")
+        reference = None
+        for name in names:
+            assert DECODERS[name](body) == expected, name
+            cpu = cpu_ms_per_page(DECODERS[name], body, args.iterations)
+            alloc = traced_peak_kib(DECODERS[name], body)
+            rss = rss_growth_kib(name, f.name)
+            reference = reference or (cpu, alloc, rss)
+            ratios = f"  ({cpu / reference[0]:.2f}x cpu, {alloc / reference[1]:.2f}x alloc)" if name != names[0] else ""
+            print(f"{name:<16}{cpu:>10.2f}{alloc:>16.0f}{rss:>16}{ratios}")
+    finally:
+        os.unlink(f.name)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
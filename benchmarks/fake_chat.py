@@ -0,0 +1,155 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Scripted chat completion service that replays deterministic tool-call sequences."""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from typing import Any, ClassVar
+
+from semantic_kernel.connectors.ai.chat_completion_client_base import ChatCompletionClientBase
+from semantic_kernel.connectors.ai.completion_usage import CompletionUsage
+from semantic_kernel.connectors.ai.prompt_execution_settings import PromptExecutionSettings
+from semantic_kernel.contents.chat_history import ChatHistory
+from semantic_kernel.contents.chat_message_content import ChatMessageContent
+from semantic_kernel.contents.function_call_content import FunctionCallContent
+from semantic_kernel.contents.streaming_chat_message_content import StreamingChatMessageContent
+from semantic_kernel.contents.utils.author_role import AuthorRole
+from semantic_kernel.contents.utils.finish_reason import FinishReason
+
+from git_plugin import estimate_tokens
+
+
+@dataclass
+class ToolCall:
+    function: str  # "Plugin-function", as the kernel names tools
+    arguments: dict = field(default_factory=dict)
+
+
+# One step of a turn: the tool calls requested in parallel, or the final answer.
+Step = list[ToolCall] | str
+
+
+class ScriptedChatCompletion(ChatCompletionClientBase):
+    """
+    Answers every user message by walking ``script``: each list of :class:`ToolCall` is returned
+    as one model response (the kernel invokes them and calls back), and the first string ends
+    the turn. The step is chosen from the number of tool-call responses since the last user
+    message, so concurrent sessions sharing one service stay independent.
+
+    ``script`` may also map text found in the system message to a script, so agents with
+    different instructions sharing one service follow their own; the first matching key wins.
+
+    Latency is modelled as ``first_token_latency`` per response plus ``seconds_per_token`` for
+    each streamed token; usage is reported with the ~4 characters per token estimate.
+    """
+
+    SUPPORTS_FUNCTION_CALLING: ClassVar[bool] = True
+
+    script: list[Any] | dict[str, list[Any]]
+    first_token_latency: float = 0.3
+    seconds_per_token: float = 0.005
+    calls: int = 0
+
+    def __init__(
+        self,
+        script: list[Step] | dict[str, list[Step]],
+        first_token_latency: float = 0.3,
+        seconds_per_token: float = 0.005,
+    ):
+        super().__init__(
+            ai_model_id="scripted-chat",
+            service_id="scripted-chat",
+            script=script,
+            first_token_latency=first_token_latency,
+            seconds_per_token=seconds_per_token,
+        )
+
+    def service_url(self) -> str | None:
+        return None
+
+    def _script(self, chat_history: ChatHistory) -> list[Step]:
+        if isinstance(self.script, list):
+            return self.script
+        system = " ".join(
+            str(message.content)
+            for message in chat_history.messages
+            if message.role in (AuthorRole.SYSTEM, AuthorRole.DEVELOPER)
+        )
+        matches = (script for key, script in self.script.items() if key in system)
+        return next(matches, ["No script matched."])
+
+    def _step(self, chat_history: ChatHistory) -> Step:
+        script = self._script(chat_history)
+        index = 0
+        for message in reversed(chat_history.messages):
+            if message.role == AuthorRole.USER:
+                break
+            if any(isinstance(item, FunctionCallContent) for item in message.items):
+                index += 1
+        return script[min(index, len(script) - 1)]
+
+    def _usage(self, chat_history: ChatHistory, output: str) -> CompletionUsage:
+        prompt = sum(estimate_tokens(str(item)) for message in chat_history.messages for item in message.items)
+        return CompletionUsage(prompt_tokens=prompt, completion_tokens=estimate_tokens(output))
+
+    @staticmethod
+    def _function_calls(step: list[ToolCall]) -> list[FunctionCallContent]:
+        return [
+            FunctionCallContent(id=f"call_{index}", index=index, name=call.function, arguments=json.dumps(call.arguments))
+            for index, call in enumerate(step)
+        ]
+
+    async def _inner_get_chat_message_contents(
+        self, chat_history: ChatHistory, settings: PromptExecutionSettings
+    ) -> list[ChatMessageContent]:
+        self.calls += 1
+        step = self._step(chat_history)
+        await asyncio.sleep(self.first_token_latency)
+        if isinstance(step, str):
+            await asyncio.sleep(self.seconds_per_token * estimate_tokens(step))
+            message = ChatMessageContent(role=AuthorRole.ASSISTANT, content=step, finish_reason=FinishReason.STOP)
+        else:
+            message = ChatMessageContent(
+                role=AuthorRole.ASSISTANT, items=self._function_calls(step), finish_reason=FinishReason.TOOL_CALLS
+            )
+        message.ai_model_id = self.ai_model_id
+        message.metadata["usage"] = self._usage(chat_history, str(step))
+        return [message]
+
+    async def _inner_get_streaming_chat_message_contents(
+        self, chat_history: ChatHistory, settings: PromptExecutionSettings, function_invoke_attempt: int = 0
+    ) -> AsyncGenerator[list[StreamingChatMessageContent], Any]:
+        self.calls += 1
+        step = self._step(chat_history)
+        usage = {"usage": self._usage(chat_history, str(step))}
+        await asyncio.sleep(self.first_token_latency)
+        if not isinstance(step, str):
+            yield [
+                StreamingChatMessageContent(
+                    role=AuthorRole.ASSISTANT,
+                    choice_index=0,
+                    items=self._function_calls(step),
+                    finish_reason=FinishReason.TOOL_CALLS,
+                    ai_model_id=self.ai_model_id,
+                    metadata=usage,
+                    function_invoke_attempt=function_invoke_attempt,
+                )
+            ]
+            return
+        words = step.split(" ")
+        for index, word in enumerate(words):
+            await asyncio.sleep(self.seconds_per_token * estimate_tokens(word))
+            last = index == len(words) - 1
+            yield [
+                StreamingChatMessageContent(
+                    role=AuthorRole.ASSISTANT,
+                    choice_index=0,
+                    content=word if last else f"{word} ",
+                    finish_reason=FinishReason.STOP if last else None,
+                    ai_model_id=self.ai_model_id,
+                    metadata=usage if last else {},
+                    function_invoke_attempt=function_invoke_attempt,
+                )
+            ]
@@ -0,0 +1,386 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Deterministic in-process stand-in for the GitHub REST and GraphQL APIs, served through ``httpx.MockTransport``."""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+import httpx
+
+BASE_URL = "https://api.github.com"
+
+_LABELS = [
+    {"id": 1, "name": "bug", "description": "Something isn't working"},
+    {"id": 2, "name": "enhancement", "description": "New feature or request"},
+    {"id": 3, "name": "documentation", "description": "Improvements or additions to documentation"},
+    {"id": 4, "name": "performance", "description": None},
+]
+_WORDS = (
+    "cache latency token retry crash timeout login page render index search commit branch label "
+    "webhook stream agent kernel plugin session history memory error parse config build deploy"
+).split()
+_ALIAS = re.compile(r"i(\d+): issueOrPullRequest")
+# Fields of the GraphQL types the mock serves, checked so a query GitHub would reject fails here too.
+_GRAPHQL_FIELDS = {
+    "Issue": {"databaseId", "id", "number", "url", "title", "state", "createdAt", "closedAt", "body", "labels"},
+    "Label": {"id", "name", "description", "color", "url", "createdAt", "updatedAt", "isDefault"},
+}
+_FRAGMENT = re.compile(r"\.\.\. on (?:Issue|PullRequest) \{([^{}]*)\}")
+_LABEL_NODES = re.compile(r"labels\([^)]*\) \{ nodes \{([^{}]*)\} \}")
+
+
+@dataclass
+class MockGitHubConfig:
+    latency: float = 0.02  # seconds per request
+    bytes_per_second: float = 5e6  # added transfer time for large bodies
+    issues: int = 3000
+    commits: int = 3000
+    rate_limit: int = 5000
+    rate_limit_window: float = 3600  # seconds until the primary budget resets
+    # Every Nth request is rejected with a secondary-limit 403 or a 429, both carrying Retry-After.
+    secondary_limit_every: int = 0
+    too_many_requests_every: int = 0
+    retry_after: float = 0.05
+    organization: str = "octo-org"
+    repo: str = "octo-repo"
+    seed: int = 7
+
+
+@dataclass
+class MockGitHubStats:
+    requests: int = 0
+    not_modified: int = 0
+    throttled: int = 0
+    bytes_sent: int = 0
+    routes: Counter = field(default_factory=Counter)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "throttled": self.throttled,
+            "bytes_sent": self.bytes_sent,
+            "routes": dict(sorted(self.routes.items())),
+        }
+
+
+class MockGitHub:
+    """
+    Serves a generated repository with GitHub's pagination (``page``/``per_page`` and ``Link``),
+    ETags with ``If-None-Match`` (304s do not consume rate limit), ``X-RateLimit-*`` headers,
+    ``since``/``until`` filters and aliased ``issueOrPullRequest`` GraphQL queries.
+
+    Like GitHub it rejects requests with a 403 once the primary budget is spent, and the
+    ``*_every`` settings of :class:`MockGitHubConfig` inject secondary-limit 403s and 429s.
+
+    ``transport`` plugs it into ``GitHubPlugin(settings, transport=...)``.
+    """
+
+    def __init__(self, config: MockGitHubConfig | None = None):
+        self.config = config or MockGitHubConfig()
+        self.stats = MockGitHubStats()
+        self.remaining = self.config.rate_limit
+        self.reset_at = time.time() + self.config.rate_limit_window
+        self.transport = httpx.MockTransport(self.handle)
+        self._generate()
+
+    def _generate(self) -> None:
+        rng = random.Random(self.config.seed)
+        owner, repo = self.config.organization, self.config.repo
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.labels = [dict(label) for label in _LABELS]
+        self.issues: dict[int, dict] = {}
+        for number in range(1, self.config.issues + 1):
+            created = start + timedelta(hours=3 * number)
+            updated = created + timedelta(hours=rng.randint(0, 500))
+            closed = rng.random() < 0.6
+            issue = {
+                "id": 100000 + number,
+                "number": number,
+                "html_url": f"https://github.com/{owner}/{repo}/issues/{number}",
+                "title": f"{' '.join(rng.sample(_WORDS, 4)).capitalize()} #{number}",
+                "state": "closed" if closed else "open",
+                "user": {"login": f"user{rng.randint(1, 40)}"},
+                "labels": rng.sample(_LABELS, rng.randint(0, 2)),
+                "created_at": _iso(created),
+                "updated_at": _iso(updated),
+                "closed_at": _iso(updated) if closed else None,
+                "body": " ".join(rng.choices(_WORDS, k=rng.randint(20, 120))),
+            }
+            if rng.random() < 0.2:
+                issue["pull_request"] = {"url": issue["html_url"].replace("issues", "pulls")}
+            self.issues[number] = issue
+        self.commits: list[dict] = []
+        for index in range(self.config.commits):
+            date = _iso(start + timedelta(hours=2 * index))
+            login = f"user{rng.randint(1, 40)}"
+            subject, text = " ".join(rng.sample(_WORDS, 5)).capitalize(), " ".join(rng.choices(_WORDS, k=30))
+            self.commits.append({
+                "sha": hashlib.sha1(f"{self.config.seed}:{index}".encode()).hexdigest(),
+                "author": {"login": login},
+                "commit": {
+                    "author": {"name": login.title(), "email": f"{login}@example.com", "date": date},
+                    "committer": {"name": login.title(), "email": f"{login}@example.com", "date": date},
+                    "message": f"{subject}\n\n{text}",
+                },
+            })
+        self.commits.reverse()  # newest first, like the API
+        self._commits_by_sha = {commit["sha"]: commit for commit in self.commits}
+
+    # region Transport
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        now = time.time()
+        if now >= self.reset_at:
+            self.remaining = self.config.rate_limit
+            self.reset_at = now + self.config.rate_limit_window
+        self.stats.requests += 1
+        headers = {
+            "X-RateLimit-Limit": str(self.config.rate_limit),
+            "X-RateLimit-Resource": "graphql" if request.url.path == "/graphql" else "core",
+            # GitHub sends whole seconds; fractions keep short benchmark windows from depending on the wall clock.
+            "X-RateLimit-Reset": f"{self.reset_at:.3f}",
+        }
+        if rejected := self._throttle(headers):
+            self.stats.throttled += 1
+            self.stats.routes["throttled"] += 1
+            await asyncio.sleep(self.config.latency)
+            return rejected
+
+        route, status, payload, link = self.route(request)
+        self.stats.routes[route] += 1
+        body = json.dumps(payload).encode() if payload is not None else b""
+        await asyncio.sleep(self.config.latency + len(body) / self.config.bytes_per_second)
+
+        if request.method == "GET" and status == 200:
+            etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                self.stats.not_modified += 1
+                headers["X-RateLimit-Remaining"] = str(self.remaining)
+                return httpx.Response(304, headers=headers)
+        self.remaining = max(0, self.remaining - 1)
+        headers["X-RateLimit-Remaining"] = str(self.remaining)
+        if link:
+            headers["Link"] = link
+        self.stats.bytes_sent += len(body)
+        return httpx.Response(status, content=body, headers={**headers, "Content-Type": "application/json"})
+
+    def _throttle(self, headers: dict[str, str]) -> httpx.Response | None:
+        """The rate-limit rejection GitHub would send instead of serving this request, if any."""
+        count, config = self.stats.requests, self.config
+        retry_after = {"Retry-After": str(config.retry_after)}
+        if config.secondary_limit_every and count % config.secondary_limit_every == 0:
+            message = "You have exceeded a secondary rate limit. Please wait a few minutes before you try again."
+            return httpx.Response(403, json={"message": message}, headers={**headers, **retry_after})
+        if config.too_many_requests_every and count % config.too_many_requests_every == 0:
+            return httpx.Response(429, json={"message": "Too Many Requests"}, headers={**headers, **retry_after})
+        if self.remaining <= 0:
+            message = "API rate limit exceeded for user ID 1."
+            return httpx.Response(403, json={"message": message}, headers={**headers, "X-RateLimit-Remaining": "0"})
+        return None
+
+    def route(self, request: httpx.Request) -> tuple[str, int, object, str | None]:
+        path = request.url.path
+        params = request.url.params
+        prefix = f"/repos/{self.config.organization}/{self.config.repo}"
+        if request.method == "POST" and path == "/graphql":
+            return "graphql", 200, self._graphql(json.loads(request.content)), None
+        if path == "/user":
+            user = {"id": 1, "login": "bench", "name": "Bench", "company": None, "html_url": "https://github.com/bench"}
+            return "user", 200, user, None
+        if path == prefix:
+            return "repo", 200, {
+                "id": 42,
+                "full_name": f"{self.config.organization}/{self.config.repo}",
+                "description": "Generated repository for benchmarks",
+                "html_url": f"https://github.com/{self.config.organization}/{self.config.repo}",
+                "default_branch": "main",
+            }, None
+        if path == f"{prefix}/labels" and request.method == "POST":
+            return self._create_label(json.loads(request.content))
+        if path == f"{prefix}/labels":
+            items, link = self._paginate(request, self.labels)
+            return "labels", 200, items, link
+        if path == f"{prefix}/issues" and request.method == "POST":
+            return "create_issue", 201, self._create_issue(json.loads(request.content)), None
+        if path == f"{prefix}/issues":
+            items, link = self._paginate(request, self._list_issues(params))
+            return "issues", 200, [_issue_summary(issue) for issue in items], link
+        if match := re.fullmatch(rf"{prefix}/issues/(\d+)", path):
+            issue = self.issues.get(int(match.group(1)))
+            if issue is None:
+                return "issue", 404, {"message": "Not Found"}, None
+            return "issue", 200, issue, None
+        if path == "/search/issues":
+            items, link = self._paginate(request, self._search_issues(params.get("q", "")))
+            return "search_issues", 200, {"total_count": len(items), "incomplete_results": False, "items": items}, link
+        if path == f"{prefix}/commits":
+            items, link = self._paginate(request, self._list_commits(params))
+            return "commits", 200, items, link
+        if match := re.fullmatch(rf"{prefix}/compare/(\w+)\.\.\.main", path):
+            return self._compare(request, match.group(1))
+        if match := re.fullmatch(rf"{prefix}/commits/(\w+)", path):
+            commit = self._commits_by_sha.get(match.group(1))
+            if commit is None:
+                return "commit", 404, {"message": "Not Found"}, None
+            return "commit", 200, _commit_detail(commit), None
+        return "unknown", 404, {"message": "Not Found"}, None
+
+    # endregion
+
+    def _list_issues(self, params: httpx.QueryParams) -> list[dict]:
+        issues = list(self.issues.values())
+        state = params.get("state", "open")
+        if state != "all":
+            issues = [issue for issue in issues if issue["state"] == state]
+        if labels := params.get("labels"):
+            issues = [issue for issue in issues if labels in {label["name"] for label in issue["labels"]}]
+        if since := params.get("since"):
+            issues = [issue for issue in issues if issue["updated_at"] >= since]
+        key = "updated_at" if params.get("sort") == "updated" else "created_at"
+        return sorted(issues, key=lambda issue: issue[key], reverse=params.get("direction", "desc") == "desc")
+
+    def _search_issues(self, query: str) -> list[dict]:
+        # Only what bulk creation sends: "repo:... is:issue in:title" with OR-ed quoted phrases.
+        phrases = [phrase.lower() for phrase in re.findall(r'"([^"]*)"', query)]
+        return [
+            _issue_summary(issue)
+            for issue in self.issues.values()
+            if "pull_request" not in issue and any(phrase in issue["title"].lower() for phrase in phrases)
+        ]
+
+    def _list_commits(self, params: httpx.QueryParams) -> list[dict]:
+        commits = self.commits
+        if author := params.get("author"):
+            commits = [commit for commit in commits if commit["author"]["login"] == author]
+        if since := params.get("since"):
+            commits = [commit for commit in commits if commit["commit"]["committer"]["date"] >= since]
+        if until := params.get("until"):
+            commits = [commit for commit in commits if commit["commit"]["committer"]["date"] <= until]
+        return commits
+
+    def _compare(self, request: httpx.Request, base: str) -> tuple[str, int, object, str | None]:
+        # History is linear, so base is an ancestor of main whenever it exists.
+        if base not in self._commits_by_sha:
+            return "compare", 404, {"message": "Not Found"}, None
+        ahead = self.commits[: self.commits.index(self._commits_by_sha[base])][::-1]
+        items, link = self._paginate(request, ahead)
+        comparison = {
+            "status": "ahead" if ahead else "identical",
+            "ahead_by": len(ahead),
+            "behind_by": 0,
+            "total_commits": len(ahead),
+            "commits": items,
+            "files": [],
+        }
+        return "compare", 200, comparison, link
+
+    def _paginate(self, request: httpx.Request, items: list) -> tuple[list, str | None]:
+        params = request.url.params
+        per_page = min(int(params.get("per_page", 30)), 100)
+        page = int(params.get("page", 1))
+        chunk = items[(page - 1) * per_page : page * per_page]
+        if page * per_page >= len(items):
+            return chunk, None
+        query = urlencode({**dict(params.multi_items()), "page": page + 1})
+        return chunk, f'<{BASE_URL}{request.url.path}?{query}>; rel="next"'
+
+    def _graphql(self, payload: dict) -> dict:
+        query = payload["query"]
+        fragments = _FRAGMENT.findall(_LABEL_NODES.sub("labels", query))
+        requested = {
+            "Issue": {name for fields in fragments for name in fields.split()},
+            "Label": {name for fields in _LABEL_NODES.findall(query) for name in fields.split()},
+        }
+        errors = [
+            {
+                "message": f"Field '{name}' doesn't exist on type '{type_name}'",
+                "extensions": {"code": "undefinedField", "typeName": type_name, "fieldName": name},
+            }
+            for type_name, names in requested.items()
+            for name in sorted(names - _GRAPHQL_FIELDS[type_name])
+        ]
+        if errors:
+            return {"errors": errors}
+        nodes = {}
+        for number in map(int, _ALIAS.findall(payload["query"])):
+            issue = self.issues.get(number)
+            nodes[f"i{number}"] = issue and {
+                "databaseId": issue["id"],
+                "number": number,
+                "url": issue["html_url"],
+                "title": issue["title"],
+                "state": issue["state"].upper(),
+                "createdAt": issue["created_at"],
+                "closedAt": issue["closed_at"],
+                "body": issue["body"],
+                "labels": {
+                    "nodes": [
+                        {"id": f"LA_{label['id']}", "name": label["name"], "description": label["description"]}
+                        for label in issue["labels"]
+                    ]
+                },
+            }
+        return {"data": {"repository": nodes}}
+
+    def _create_label(self, payload: dict) -> tuple[str, int, object, None]:
+        if any(label["name"].lower() == payload["name"].lower() for label in self.labels):
+            error = {"message": "Validation Failed", "errors": [{"resource": "Label", "code": "already_exists"}]}
+            return "create_label", 422, error, None
+        label = {"id": len(self.labels) + 1, "name": payload["name"], "description": payload.get("description") or None}
+        self.labels.append(label)
+        return "create_label", 201, label, None
+
+    def _create_issue(self, payload: dict) -> dict:
+        number = max(self.issues) + 1
+        now = _iso(datetime.now(timezone.utc))
+        issue = {
+            "id": 100000 + number,
+            "number": number,
+            "html_url": f"https://github.com/{self.config.organization}/{self.config.repo}/issues/{number}",
+            "title": payload["title"],
+            "state": "open",
+            "user": {"login": "bench"},
+            "labels": [label for label in self.labels if label["name"] in payload.get("labels", [])],
+            "created_at": now,
+            "updated_at": now,
+            "closed_at": None,
+            "body": payload.get("body"),
+        }
+        self.issues[number] = issue
+        return issue
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _issue_summary(issue: dict) -> dict:
+    return {key: value for key, value in issue.items() if key != "body"}
+
+
+def _commit_detail(commit: dict) -> dict:
+    files = [
+        {
+            "filename": f"src/module_{i}.py",
+            "status": "modified",
+            "additions": 10 + i,
+            "deletions": i,
+            "changes": 10 + 2 * i,
+            "patch": "\n".join(f"+    value_{j} = compute({j})" for j in range(10 + i)),
+        }
+        for i in range(6)
+    ]
+    additions = sum(f["additions"] for f in files)
+    deletions = sum(f["deletions"] for f in files)
+    stats = {"additions": additions, "deletions": deletions, "total": additions + deletions}
+    return {**commit, "stats": stats, "files": files}
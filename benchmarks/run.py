@@ -0,0 +1,304 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""
+Offline benchmarks of GitHubPlugin and the agent loop against MockGitHub and a scripted chat service.
+
+    python -m benchmarks.run                    # run every scenario and compare with baseline.json
+    python -m benchmarks.run -s repeated_queries
+    python -m benchmarks.run --save-baseline    # record the current results as the baseline
+
+Exits with status 1 when a scenario regresses beyond the tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from semantic_kernel import Kernel
+from semantic_kernel.agents import ChatCompletionAgent
+from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
+from semantic_kernel.functions.kernel_arguments import KernelArguments
+
+from agent_router import AgentRouter
+from benchmarks.fake_chat import ScriptedChatCompletion, Step, ToolCall
+from benchmarks.mock_github import MockGitHub, MockGitHubConfig
+from git_plugin import GitHubPlugin, GitHubSettings
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+ORG, REPO = MockGitHubConfig.organization, MockGitHubConfig.repo
+
+
+class Bench:
+    """A fresh mock API, plugin and index directory for one scenario run."""
+
+    def __init__(self, mock: MockGitHubConfig | None = None, **settings):
+        self.mock = MockGitHub(mock)
+        self._tmp = tempfile.TemporaryDirectory()
+        self.plugin = GitHubPlugin(
+            GitHubSettings(
+                token="bench", index_dir=self._tmp.name, mirror_dir=os.path.join(self._tmp.name, "mirrors"), **settings
+            ),
+            transport=self.mock.transport,
+        )
+        self.llms: list[ScriptedChatCompletion] = []
+
+    def agent(self, script: list[Step], llm: ScriptedChatCompletion | None = None) -> ChatCompletionAgent:
+        llm = llm or ScriptedChatCompletion(script, first_token_latency=0.05, seconds_per_token=0.001)
+        kernel = Kernel()
+        kernel.add_service(llm)
+        kernel.add_plugin(self.plugin, plugin_name="GithubPlugin")
+        settings = kernel.get_prompt_execution_settings_from_service_id(llm.service_id)
+        settings.function_choice_behavior = FunctionChoiceBehavior.Auto()
+        self.llms.append(llm)
+        return ChatCompletionAgent(
+            kernel=kernel,
+            name="GitAssistantAgent",
+            instructions=f"Answer questions about {ORG}/{REPO}.",
+            arguments=KernelArguments(settings=settings),
+        )
+
+    async def turn(self, agent: ChatCompletionAgent, question: str) -> float:
+        started = time.perf_counter()
+        async for _ in agent.invoke_stream(messages=question):
+            pass
+        return time.perf_counter() - started
+
+    async def close(self) -> None:
+        await self.plugin.aclose()
+        for index in self.plugin._indexes.values():
+            index.close()
+        self._tmp.cleanup()
+
+
+async def timed(call: Callable[[], Awaitable]) -> float:
+    started = time.perf_counter()
+    await call()
+    return time.perf_counter() - started
+
+
+# region Scenarios
+
+
+async def repeated_queries(bench: Bench) -> list[float]:
+    """The same question asked in 10 fresh sessions; after the first, every GitHub read is cached."""
+    script = [
+        [
+            ToolCall("GithubPlugin-get_repository", {"organization": ORG, "repo": REPO}),
+            ToolCall("GithubPlugin-get_issues", {"organization": ORG, "repo": REPO, "state": "open"}),
+        ],
+        "The repository has these open issues.",
+    ]
+    return [await bench.turn(bench.agent(script), "What are the open issues?") for _ in range(10)]
+
+
+async def paginated_listing(bench: Bench) -> list[float]:
+    """1,000 issues across 10 pages, listed 5 times with the response cache disabled."""
+    return [
+        await timed(lambda: bench.plugin.get_issues(ORG, REPO, max_results=1000, state="all")) for _ in range(5)
+    ]
+
+
+async def throttled_listing(bench: Bench) -> list[float]:
+    """The paginated listing while every 4th request gets a secondary-limit 403 and every 7th a 429."""
+    return await paginated_listing(bench)
+
+
+async def paced_listing(bench: Bench) -> list[float]:
+    """The paginated listing on a budget of 30 requests per 2 seconds, so it is paced throughout."""
+    return await paginated_listing(bench)
+
+
+async def bulk_issue_details(bench: Bench) -> list[float]:
+    """Details of 200 issues in one call, 5 times."""
+    numbers = list(range(1, 201))
+    return [await timed(lambda: bench.plugin.get_issue_details(ORG, REPO, numbers)) for _ in range(5)]
+
+
+async def concurrent_sessions(bench: Bench) -> list[float]:
+    """16 sessions running a two-step tool-calling turn at the same time."""
+    script = [
+        [
+            ToolCall("GithubPlugin-get_repository", {"organization": ORG, "repo": REPO}),
+            ToolCall("GithubPlugin-get_commits", {"organization": ORG, "repo": REPO, "max_results": 100}),
+        ],
+        [
+            ToolCall(
+                "GithubPlugin-get_issue_details",
+                {"organization": ORG, "repo": REPO, "issue_ids": list(range(1, 21))},
+            )
+        ],
+        "Here is what changed recently.",
+    ]
+    agents = [bench.agent(script) for _ in range(16)]
+    return list(await asyncio.gather(*(bench.turn(agent, "What changed recently?") for agent in agents)))
+
+
+async def routed_fan_out(bench: Bench) -> list[float]:
+    """5 questions that the router splits into issue, commit and repository agents running concurrently."""
+    plan = json.dumps({
+        "issues": "Which issues are open?",
+        "commits": "What changed recently?",
+        "repository": "What is the repository about?",
+    })
+    llm = ScriptedChatCompletion(
+        {
+            "Split the user's question": [plan],
+            "issues and pull requests": [
+                [ToolCall("GithubPlugin-get_issues", {"organization": ORG, "repo": REPO, "state": "open"})],
+                "These issues are open.",
+            ],
+            "commit history": [
+                [ToolCall("GithubPlugin-get_commits", {"organization": ORG, "repo": REPO, "max_results": 100})],
+                "These commits landed recently.",
+            ],
+            "metadata": [
+                [ToolCall("GithubPlugin-get_repository", {"organization": ORG, "repo": REPO})],
+                "The repository is a mock.",
+            ],
+            "Combine the answers": ["Open issues, recent commits and what the repository is about."],
+        },
+        first_token_latency=0.05,
+        seconds_per_token=0.001,
+    )
+    kernel = Kernel()
+    kernel.add_service(llm)
+    kernel.add_plugin(bench.plugin, plugin_name="GithubPlugin")
+    bench.llms.append(llm)
+    router = AgentRouter(kernel, llm.service_id)
+    question = "Which issues are open, what changed recently and what is the repository about?"
+    return [await timed(lambda: router.answer(question, context=f"The repository: {ORG}/{REPO}")) for _ in range(5)]
+
+
+@dataclass
+class Scenario:
+    run: Callable[[Bench], Awaitable[list[float]]]
+    settings: dict
+    mock: MockGitHubConfig | None = None
+
+
+SCENARIOS = {
+    "repeated_queries": Scenario(repeated_queries, {}),
+    "paginated_listing": Scenario(paginated_listing, {"cache_enabled": False}),
+    "throttled_listing": Scenario(
+        throttled_listing,
+        # A small backoff base so the Retry-After, not the random jitter, sets each wait.
+        {"cache_enabled": False, "backoff_base": 0.01},
+        MockGitHubConfig(secondary_limit_every=4, too_many_requests_every=7),
+    ),
+    "paced_listing": Scenario(
+        paced_listing, {"cache_enabled": False}, MockGitHubConfig(rate_limit=30, rate_limit_window=2)
+    ),
+    "bulk_issue_details": Scenario(bulk_issue_details, {}),
+    "concurrent_sessions": Scenario(concurrent_sessions, {}),
+    "routed_fan_out": Scenario(routed_fan_out, {}),
+}
+
+# endregion
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+async def measure(name: str) -> dict:
+    scenario = SCENARIOS[name]
+    bench = Bench(scenario.mock, **scenario.settings)
+    try:
+        latencies = await scenario.run(bench)
+    finally:
+        await bench.close()
+    # A second run under tracemalloc: tracing slows allocation-heavy code, so it is not timed.
+    allocating = Bench(scenario.mock, **scenario.settings)
+    tracemalloc.start()
+    try:
+        await scenario.run(allocating)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        await allocating.close()
+    return {
+        "operations": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "requests": bench.mock.stats.requests,
+        "not_modified": bench.mock.stats.not_modified,
+        "throttled": bench.mock.stats.throttled,
+        "paced_seconds": bench.plugin.scheduler.stats.as_dict()["paced_seconds"],
+        "bytes_received": bench.mock.stats.bytes_sent,
+        "llm_calls": sum(llm.calls for llm in bench.llms),
+        "peak_alloc_kib": round(peak / 1024),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions against the baseline: slower by more than ``tolerance``, or more requests."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "peak_alloc_kib"):
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {result[metric]} > baseline {base[metric]} (+{tolerance:.0%})")
+        for metric in ("requests", "llm_calls"):
+            if result[metric] > base[metric]:
+                regressions.append(f"{name}: {metric} {result[metric]} > baseline {base[metric]}")
+    return regressions
+
+
+def print_table(results: dict, baseline: dict) -> None:
+    columns = ("operations", "p50_ms", "p95_ms", "requests", "not_modified", "llm_calls", "peak_alloc_kib")
+    print(f"{'scenario':<22}" + "".join(f"{column:>16}" for column in columns))
+    for name, result in results.items():
+        cells = []
+        for column in columns:
+            base = baseline.get(name, {}).get(column)
+            cell = f"{result[column]}"
+            if base not in (None, 0) and column != "operations":
+                cell += f" ({(result[column] - base) / base:+.0%})"
+            cells.append(f"{cell:>16}")
+        print(f"{name:<22}" + "".join(cells))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS), help="run only these")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    names = args.scenario or list(SCENARIOS)
+    results = {name: asyncio.run(measure(name)) for name in names}
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_table(results, {} if args.save_baseline else baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({**baseline, **results}, f, indent=2)
+            f.write("\n")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
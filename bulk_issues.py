@@ -0,0 +1,233 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Create many GitHub issues from a CSV or JSON export, skipping the ones that already exist."""
+
+import asyncio
+import csv
+import hashlib
+import io
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from urllib.parse import quote
+
+import httpx
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
+
+from git_plugin import GitHubPlugin
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(title.lower().split())
+
+
+def fingerprint(title: str) -> str:
+    return hashlib.sha1(normalize_title(title).encode()).hexdigest()[:16]
+
+
+# GitHub rejects search queries longer than 256 characters or with more than five AND/OR/NOT operators.
+_MAX_QUERY_CHARS = 256
+_MAX_OPERATORS = 5
+
+
+def title_queries(organization: str, repo: str, titles: list[str]) -> list[str]:
+    """Issue search queries that together look up every title as an ``in:title`` phrase."""
+    prefix = f"repo:{organization}/{repo} is:issue in:title"
+    budget = _MAX_QUERY_CHARS - len(prefix) - 1
+    queries, phrases = [], []
+    for title in dict.fromkeys(" ".join(t.replace('"', " ").replace("\\", " ").split()) for t in titles):
+        if not title:
+            continue
+        if len(title) > budget - 2:
+            # A leading part of a long title still finds it; hits are compared in full afterwards.
+            title = title[: budget - 2].rsplit(" ", 1)[0]
+        candidate = phrases + [f'"{title}"']
+        if phrases and (len(candidate) > _MAX_OPERATORS + 1 or len(" OR ".join(candidate)) > budget):
+            queries.append(f"{prefix} {' OR '.join(phrases)}")
+            candidate = candidate[-1:]
+        phrases = candidate
+    if phrases:
+        queries.append(f"{prefix} {' OR '.join(phrases)}")
+    return queries
+
+
+class IssueDraft(BaseModel):
+    """One row of an upload. Without an explicit ``fingerprint`` the normalized title identifies it."""
+
+    title: str = Field(..., min_length=1)
+    body: str = ""
+    labels: list[str] = Field(default_factory=list)
+    fingerprint: str = ""
+
+    @model_validator(mode="before")
+    @classmethod
+    def aliases(cls, data):
+        # Triage exports name these columns differently.
+        if isinstance(data, dict):
+            data = {key.strip().lower(): value for key, value in data.items() if key}
+            if not data.get("body") and data.get("description"):
+                data["body"] = data["description"]
+            if not data.get("fingerprint") and data.get("id"):
+                data["fingerprint"] = str(data["id"])
+        return data
+
+    @field_validator("labels", mode="before")
+    @classmethod
+    def split_labels(cls, labels):
+        if isinstance(labels, str):
+            labels = labels.replace(";", ",").split(",")
+        return [label.strip() for label in labels or [] if label and label.strip()]
+
+    @model_validator(mode="after")
+    def default_fingerprint(self) -> "IssueDraft":
+        self.fingerprint = self.fingerprint.strip() or fingerprint(self.title)
+        return self
+
+
+def parse_drafts(content: bytes | str, filename: str = "") -> list[IssueDraft]:
+    """
+    Read issue drafts from a JSON list of objects (or ``{"issues": [...]}``) or from a CSV file
+    with a ``title`` column and optional ``body``/``description``, ``labels`` (comma or semicolon
+    separated) and ``fingerprint``/``id`` columns.
+    """
+    text = content.decode("utf-8-sig") if isinstance(content, bytes) else content
+    if filename.lower().endswith(".json") or text.lstrip().startswith(("[", "{")):
+        data = json.loads(text)
+        rows = data.get("issues", []) if isinstance(data, dict) else data
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+    drafts = []
+    for number, row in enumerate(rows, 1):
+        try:
+            drafts.append(IssueDraft.model_validate(row))
+        except ValidationError as exc:
+            raise ValueError(f"Row {number}: {exc.errors()[0]['msg']}") from exc
+    return drafts
+
+
+@dataclass
+class BulkResult:
+    """Outcome of one draft: "created", "duplicate" or "failed"."""
+
+    index: int
+    title: str
+    status: str
+    number: int | None = None
+    url: str | None = None
+    detail: str = ""
+
+
+class BulkIssueCreator:
+    """
+    Creates issue drafts in one repository.
+
+    Before anything is written the drafts' titles are looked up with GitHub's issue search
+    (``in:title``, several titles per query), which covers the repository's whole history:
+    drafts whose title matches an existing issue, whose fingerprint was already created by an
+    earlier run, or which repeat an earlier row of the upload are reported as duplicates.
+    Missing labels are then created once each, and the remaining issues are created at most
+    ``write_concurrency`` at a time, paced by ``GitHubPlugin.post``.
+
+    Every creation is journaled in the repository's index ("pending" before the request,
+    "created" after it), so running the same upload again after a partial failure only creates
+    what is missing. A pending entry whose outcome was lost is resolved by the title match.
+    """
+
+    def __init__(self, plugin: GitHubPlugin, concurrency: int | None = None):
+        self.plugin = plugin
+        self.concurrency = concurrency or plugin.settings.write_concurrency
+
+    async def run(self, organization: str, repo: str, drafts: list[IssueDraft]) -> AsyncIterator[BulkResult]:
+        """Yield one result per draft, duplicates first and created issues as they complete."""
+        if not drafts:
+            return
+        index = self.plugin.get_index(organization, repo)
+        journal = index.journal_entries([draft.fingerprint for draft in drafts])
+        unresolved = [d.title for d in drafts if journal.get(d.fingerprint, {}).get("status") != "created"]
+        existing = await self.find_existing(organization, repo, unresolved)
+
+        pending: list[tuple[int, IssueDraft]] = []
+        seen: dict[str, int] = {}
+        for position, draft in enumerate(drafts):
+            entry = journal.get(draft.fingerprint)
+            match = existing.get(normalize_title(draft.title))
+            if entry and entry["status"] == "created":
+                yield BulkResult(
+                    position, draft.title, "duplicate", entry["number"], entry["url"], "created by an earlier run"
+                )
+            elif match:
+                if entry:
+                    index.journal(draft.fingerprint, draft.title, "created", match["number"], match["url"])
+                yield BulkResult(
+                    position, draft.title, "duplicate", match["number"], match["url"], "title already exists"
+                )
+            elif draft.fingerprint in seen:
+                detail = f"repeats row {seen[draft.fingerprint] + 1}"
+                yield BulkResult(position, draft.title, "duplicate", detail=detail)
+            else:
+                seen[draft.fingerprint] = position
+                pending.append((position, draft))
+        if not pending:
+            return
+
+        labels = {label for _, draft in pending for label in draft.labels}
+        failed_labels = await self._ensure_labels(organization, repo, labels)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def create(position: int, draft: IssueDraft) -> BulkResult:
+            missing = [label for label in draft.labels if label.lower() in failed_labels]
+            if missing:
+                return BulkResult(position, draft.title, "failed", detail=f"could not create labels {missing}")
+            async with semaphore:
+                index.journal(draft.fingerprint, draft.title, "pending")
+                try:
+                    issue = await self.plugin.create_issue(organization, repo, draft.title, draft.body, draft.labels)
+                except Exception as exc:
+                    # A rejected request is forgotten; after a lost response the entry stays pending
+                    # and the next run's title match tells whether the issue was created.
+                    if isinstance(exc, httpx.HTTPStatusError):
+                        index.forget(draft.fingerprint)
+                    return BulkResult(position, draft.title, "failed", detail=str(exc))
+                index.journal(draft.fingerprint, draft.title, "created", issue["number"], issue["html_url"])
+                return BulkResult(position, draft.title, "created", issue["number"], issue["html_url"])
+
+        tasks = [asyncio.ensure_future(create(position, draft)) for position, draft in pending]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def find_existing(self, organization: str, repo: str, titles: list[str]) -> dict[str, dict]:
+        """
+        Issues (not pull requests) whose normalized title equals one of ``titles``, by normalized
+        title. Search matches words rather than whole titles, so every hit is compared exactly.
+        """
+        wanted = {normalize_title(title) for title in titles}
+        found: dict[str, dict] = {}
+        for query in title_queries(organization, repo, titles):
+            path = f"/search/issues?q={quote(query, safe='')}&per_page=100"
+            while path:
+                result, path = await self.plugin.get_page(path)
+                for item in result.get("items", []):
+                    title = normalize_title(item["title"])
+                    if title in wanted and "pull_request" not in item:
+                        found.setdefault(title, {"number": item["number"], "url": item["html_url"]})
+        return found
+
+    async def _ensure_labels(self, organization: str, repo: str, names: set[str]) -> set[str]:
+        """Create the labels that do not exist yet and return the (lower-cased) ones that failed."""
+        if not names:
+            return set()
+        defined = {label["name"].lower() for label in await self.plugin.get_labels(organization, repo)}
+        failed = set()
+        for name in sorted(names):
+            if name.lower() in defined:
+                continue
+            try:
+                await self.plugin.create_label(organization, repo, name)
+            except Exception:
+                failed.add(name.lower())
+            defined.add(name.lower())
+        return failed
@@ -0,0 +1,255 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Blobless bare clone of a repository, queried with the git CLI and shaped like GitHub's REST payloads."""
+
+import asyncio
+import base64
+import os
+import time
+from datetime import datetime, timezone
+
+# The tree of a repository with no files, used as the parent of root commits.
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+# GitHub lists at most this many commits in a compare response.
+MAX_COMPARE_COMMITS = 250
+
+_FORMAT = "%H%x1f%an%x1f%ae%x1f%ad%x1f%cn%x1f%ce%x1f%cd%x1f%B"
+_DATE = "--date=format-local:%Y-%m-%dT%H:%M:%SZ"
+_STATUS = {"A": "added", "D": "removed", "M": "modified", "R": "renamed", "C": "copied", "T": "changed"}
+_UNKNOWN_REVISION = ("unknown revision", "bad revision", "bad object", "invalid object name", "not a valid object")
+
+
+class GitMirrorError(Exception):
+    """Raised when a git command against the mirror fails."""
+
+
+class GitMirror:
+    """
+    A bare, blobless partial clone (``--filter=blob:none``) of one repository.
+
+    Commits and trees are fetched incrementally with ``git fetch``; file contents are only
+    downloaded when a diff or blame needs them, and are then kept. Results use the field names of
+    the REST API so the same models and projections apply to both backends.
+
+    Args:
+        path: Directory of the bare repository; created by the first :meth:`update`.
+        url: Clone URL, e.g. ``https://github.com/owner/repo.git`` or ``file:///srv/repo.git``.
+        token: Sent as HTTP basic credentials, the way GitHub accepts installation and personal tokens.
+        web_url: Base of the ``html_url`` links in results.
+    """
+
+    def __init__(self, path: str, url: str, token: str | None = None, web_url: str | None = None):
+        self.path = path
+        self.url = url
+        self.web_url = web_url or url.removesuffix(".git")
+        self._env = {**os.environ, "GIT_TERMINAL_PROMPT": "0", "LC_ALL": "C", "TZ": "UTC"}
+        if token:
+            # Passed through the environment so the token never appears in a process listing.
+            credentials = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+            self._env.update({
+                "GIT_CONFIG_COUNT": "1",
+                "GIT_CONFIG_KEY_0": "http.extraHeader",
+                "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+            })
+        self._lock = asyncio.Lock()
+        self._fetched_at = 0.0
+
+    def exists(self) -> bool:
+        return os.path.isdir(os.path.join(self.path, "objects"))
+
+    async def update(self, max_age: float = 0) -> bool:
+        """Clone the mirror, or fetch new commits if the last fetch is older than ``max_age`` seconds."""
+        async with self._lock:
+            if self.exists() and time.time() - self._fetched_at < max_age:
+                return False
+            if not self.exists():
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                await self._git("clone", "--bare", "--filter=blob:none", "--quiet", self.url, self.path, in_repo=False)
+                await self._git("config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+            else:
+                await self._git("fetch", "--prune", "--quiet", "--tags", "origin")
+            self._fetched_at = time.time()
+            return True
+
+    # region Queries
+
+    async def log(
+        self,
+        rev: str = "HEAD",
+        max_count: int | None = None,
+        author: str = "",
+        since: str = "",
+        until: str = "",
+        path: str = "",
+    ) -> list[dict]:
+        """Commits reachable from ``rev``, newest first; with ``path`` only those touching it, following renames."""
+        args = ["log", "-z", f"--format={_FORMAT}", _DATE]
+        if max_count:
+            args.append(f"--max-count={max_count}")
+        if author:
+            args += ["--fixed-strings", f"--author={author}"]
+        if since:
+            args.append(f"--since={since}")
+        if until:
+            args.append(f"--until={until}")
+        args.append(_revision(rev))
+        if path:
+            args += ["--follow", "--", path]
+        output = await self._git_rev(*args)
+        return [_commit(record) for record in output.split("\0") if record.strip()]
+
+    async def commit(self, sha: str) -> dict:
+        """One commit with its stats and per-file patches against its first parent."""
+        sha = _revision(sha)
+        output = await self._git_rev("show", "-s", "-z", f"--format={_FORMAT}%x1f%P", _DATE, sha)
+        *fields, parents = output.rstrip("\0").split("\x1f")
+        commit = _commit("\x1f".join(fields))
+        files = await self._diff(parents.split()[0] if parents.strip() else EMPTY_TREE, commit["sha"])
+        return {
+            **commit,
+            "html_url": f"{self.web_url}/commit/{commit['sha']}",
+            "stats": _stats(files),
+            "files": files,
+        }
+
+    async def compare(self, base: str, head: str) -> dict:
+        """
+        ``base...head`` like the compare API: files changed since the merge base, the commits of
+        ``head`` not in ``base`` (oldest first, at most 250) and how far the two have diverged.
+        """
+        base, head = _revision(base), _revision(head)
+        counts = await self._git_rev("rev-list", "--left-right", "--count", f"{base}...{head}")
+        behind_by, ahead_by = map(int, counts.split())
+        merge_base = (await self._git_rev("merge-base", base, head)).strip()
+        commits = await self.log(f"{base}..{head}", max_count=MAX_COMPARE_COMMITS)
+        files = await self._diff(merge_base, head)
+        if ahead_by and behind_by:
+            status = "diverged"
+        elif ahead_by or behind_by:
+            status = "ahead" if ahead_by else "behind"
+        else:
+            status = "identical"
+        return {
+            "html_url": f"{self.web_url}/compare/{base}...{head}",
+            "status": status,
+            "ahead_by": ahead_by,
+            "behind_by": behind_by,
+            "total_commits": ahead_by,
+            "commits": list(reversed(commits)),
+            "files": files,
+        }
+
+    async def blame(
+        self, path: str, rev: str = "HEAD", start_line: int = 1, end_line: int | None = None
+    ) -> list[dict]:
+        """Line ranges of ``path`` at ``rev`` with the commit that last changed each range."""
+        line_range = f"{start_line},{end_line}" if end_line else f"{start_line},"
+        output = await self._git_rev("blame", "--line-porcelain", "-L", line_range, _revision(rev), "--", path)
+        ranges: list[dict] = []
+        headers: dict[str, str] = {}
+        for line in output.split("\n"):
+            if line.startswith("\t"):
+                sha, _, final_line = headers["sha"].split(" ")[:3]
+                if ranges and ranges[-1]["sha"] == sha and ranges[-1]["end_line"] == int(final_line) - 1:
+                    ranges[-1]["end_line"] += 1
+                    ranges[-1]["lines"].append(line[1:])
+                else:
+                    authored = datetime.fromtimestamp(int(headers["author-time"]), timezone.utc)
+                    ranges.append({
+                        "sha": sha,
+                        "author": headers.get("author"),
+                        "date": authored.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                        "summary": headers.get("summary", ""),
+                        "start_line": int(final_line),
+                        "end_line": int(final_line),
+                        "lines": [line[1:]],
+                    })
+                headers = {}
+            elif line:
+                key, _, value = line.partition(" ")
+                if not headers:
+                    headers["sha"] = line
+                else:
+                    headers[key] = value
+        return ranges
+
+    # endregion
+
+    async def _diff(self, base: str, head: str) -> list[dict]:
+        """Per-file entries shaped like the ``files`` of the commit and compare APIs."""
+        diff = ("diff", "--no-ext-diff", "--no-color", "--find-renames")
+        numstat = (await self._git(*diff, "--numstat", "-z", base, head)).split("\0")
+        statuses = (await self._git(*diff, "--name-status", "-z", base, head)).split("\0")
+        patch = await self._git(*diff, base, head)
+        # Every listing is in the same diff-queue order, so the n-th patch belongs to the n-th file.
+        patches = patch.split("\ndiff --git ") if patch else []
+        files = []
+        while statuses and statuses[0]:
+            code = statuses.pop(0)
+            names = [statuses.pop(0)] + ([statuses.pop(0)] if code[0] in "RC" else [])
+            added, deleted, name = numstat.pop(0).split("\t")
+            if not name:  # renames list both names after the counts
+                numstat = numstat[2:]
+            chunk = patches[len(files)] if len(files) < len(patches) else ""
+            hunk = chunk.find("\n@@")
+            entry = {
+                "filename": names[-1],
+                "status": _STATUS.get(code[0], "modified"),
+                "additions": int(added) if added != "-" else 0,
+                "deletions": int(deleted) if deleted != "-" else 0,
+                "patch": chunk[hunk + 1 :].rstrip("\n") if hunk >= 0 else None,
+            }
+            entry["changes"] = entry["additions"] + entry["deletions"]
+            if len(names) == 2:
+                entry["previous_filename"] = names[0]
+            files.append(entry)
+        return files
+
+    async def _git_rev(self, *args: str) -> str:
+        """Run a query; a revision the mirror does not have yet triggers one fetch and a retry."""
+        try:
+            return await self._git(*args)
+        except GitMirrorError as exc:
+            if not any(message in str(exc).lower() for message in _UNKNOWN_REVISION):
+                raise
+        await self.update()
+        return await self._git(*args)
+
+    async def _git(self, *args: str, in_repo: bool = True) -> str:
+        command = ["git", "-C", self.path, *args] if in_repo else ["git", *args]
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, env=self._env
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise GitMirrorError(f"git {args[0]} failed: {stderr.decode(errors='replace').strip()}")
+        return stdout.decode(errors="replace")
+
+
+def _revision(rev: str) -> str:
+    # Revisions come from tool arguments; never let one be parsed as an option.
+    if not rev or rev.startswith("-"):
+        raise GitMirrorError(f"Invalid revision {rev!r}")
+    return rev
+
+
+def _commit(record: str) -> dict:
+    sha, author_name, author_email, authored, committer_name, committer_email, committed, message = (
+        record.lstrip("\n").split("\x1f", 7)
+    )
+    return {
+        "sha": sha,
+        "author": None,  # GitHub logins are not known locally; models fall back to the author name
+        "commit": {
+            "author": {"name": author_name, "email": author_email, "date": authored},
+            "committer": {"name": committer_name, "email": committer_email, "date": committed},
+            "message": message.rstrip("\n"),
+        },
+    }
+
+
+def _stats(files: list[dict]) -> dict:
+    additions = sum(f["additions"] for f in files)
+    deletions = sum(f["deletions"] for f in files)
+    return {"additions": additions, "deletions": deletions, "total": additions + deletions}
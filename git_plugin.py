@@ -1,11 +1,33 @@
 # Copyright (c) Microsoft. All rights reserved.
 
 
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
 import httpx
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, AliasPath, BaseModel, Field, TypeAdapter, field_validator
 
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 
+from git_mirror import GitMirror, GitMirrorError
+from repo_index import RepoIndex
+from request_scheduler import RequestScheduler
+from response_cache import CachedResponse, ResponseCache
+from search_index import SearchIndex
+from single_flight import SingleFlight, request_key
+from telemetry import CACHE_OUTCOME, GITHUB_REQUEST_SPAN, RATE_LIMIT_REMAINING, RESPONSE_BYTES, tracer
+
 # region GitHub Models
 
 
@@ -25,7 +47,8 @@ class User(BaseModel):
 
 
 class Label(BaseModel):
-    id: int = Field(..., alias="id")
+    # The REST id; GraphQL's Label type has no databaseId, so labels read through GraphQL have none.
+    id: int | None = Field(default=None, alias="id")
     name: str = Field(..., alias="name")
     description: str | None = Field(default=None, alias="description")
 
@@ -45,29 +68,369 @@ class IssueDetail(Issue):
     body: str | None = Field(default=None, alias="body")
 
 
+class CommitSummary(BaseModel):
+    sha: str = Field(..., alias="sha")
+    author: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices(AliasPath("author", "login"), AliasPath("commit", "author", "name")),
+    )
+    date: str | None = Field(default=None, validation_alias=AliasPath("commit", "author", "date"))
+    message: str = Field(..., validation_alias=AliasPath("commit", "message"))
+
+    @field_validator("message")
+    @classmethod
+    def subject_line(cls, message: str) -> str:
+        return message.split("\n", 1)[0]
+
+
+class CommitStats(BaseModel):
+    additions: int = Field(default=0, alias="additions")
+    deletions: int = Field(default=0, alias="deletions")
+    total: int = Field(default=0, alias="total")
+
+
+class CommitFile(BaseModel):
+    filename: str = Field(..., alias="filename")
+    status: str = Field(..., alias="status")
+    additions: int = Field(default=0, alias="additions")
+    deletions: int = Field(default=0, alias="deletions")
+    previous_filename: str | None = Field(default=None, alias="previous_filename")
+    patch: str | None = Field(default=None, alias="patch")
+    patch_truncated: bool = False
+
+
+class CommitDetail(BaseModel):
+    sha: str = Field(..., alias="sha")
+    url: str = Field(..., alias="html_url")
+    author: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices(AliasPath("author", "login"), AliasPath("commit", "author", "name")),
+    )
+    date: str | None = Field(default=None, validation_alias=AliasPath("commit", "author", "date"))
+    message: str = Field(..., validation_alias=AliasPath("commit", "message"))
+    stats: CommitStats = Field(default_factory=CommitStats, alias="stats")
+    files_changed: int = 0
+    files: list[CommitFile] | None = None
+    # The API listed only part of the files and the local mirror could not be used instead, or
+    # files were dropped to fit the token budget.
+    truncated: bool = Field(default=False, alias="truncated")
+    tokens_saved: int = 0
+
+
+class Comparison(BaseModel):
+    url: str = Field(..., alias="html_url")
+    status: str = Field(..., alias="status")
+    ahead_by: int = Field(..., alias="ahead_by")
+    behind_by: int = Field(..., alias="behind_by")
+    total_commits: int = Field(..., alias="total_commits")
+    commits: list[CommitSummary] = Field(default_factory=list, alias="commits")
+    stats: CommitStats = Field(default_factory=CommitStats)
+    files_changed: int = 0
+    files: list[CommitFile] | None = None
+    # The API listed only part of the files or commits and the local mirror could not be used instead,
+    # or files were dropped to fit the token budget.
+    truncated: bool = Field(default=False, alias="truncated")
+    tokens_saved: int = 0
+
+
+class BlameRange(BaseModel):
+    sha: str = Field(..., alias="sha")
+    author: str | None = Field(default=None, alias="author")
+    date: str | None = Field(default=None, alias="date")
+    summary: str = Field(default="", alias="summary")
+    start_line: int = Field(..., alias="start_line")
+    end_line: int = Field(..., alias="end_line")
+    lines: list[str] = Field(default_factory=list, alias="lines")
+
+
 # endregion
 
 
+# GitHub's maximum page size for list endpoints.
+MAX_PER_PAGE = 100
+# Page size GitHub uses when none is requested; kernel functions keep it as their default cap.
+DEFAULT_MAX_RESULTS = 30
+
+# The commit and compare APIs list at most this many files; larger diffs are truncated.
+MAX_API_FILES = 300
+
+# Issues resolved per GraphQL query; keeps each query well under GitHub's node limits.
+GRAPHQL_BATCH_SIZE = 50
+
+# Decoders that validate a raw response body straight into models. pydantic-core parses the
+# bytes itself and skips fields the models do not declare, so no intermediate dict tree is built.
+ISSUE_PAGE = TypeAdapter(list[Issue])
+ISSUE_DETAIL = TypeAdapter(IssueDetail)
+REPO = TypeAdapter(Repo)
+USER = TypeAdapter(User)
+
+# Bodies that are consumed as dicts (index sync, commits, projections) use orjson when it is installed.
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    _loads = orjson.loads
+else:
+    _loads = json.loads
+
+_NEXT_LINK = re.compile(r'<([^>]+)>;\s*rel="next"')
+_COMMIT_SHA = re.compile(r"[0-9a-f]{40}")
+_REPO_PATH = re.compile(r"^/repos/([^/?]+/[^/?]+)")
+
+# When set to a list, every GitHub call made in the current context appends ``(path, version)``:
+# the ETag or Last-Modified of a GET, or ``None`` for calls that cannot be revalidated.
+resource_versions: ContextVar[list[tuple[str, str | None]] | None] = ContextVar("resource_versions", default=None)
+
+_ISSUE_DETAIL_FIELDS = """
+    databaseId number url title state createdAt closedAt body
+    labels(first: 50) { nodes { name description } }
+"""
+
+# GraphQL reports merged pull requests as MERGED; the REST issues API reports them as closed.
+_GRAPHQL_STATES = {"OPEN": "open", "CLOSED": "closed", "MERGED": "closed"}
+
+
+# Output shapes for commit and compare payloads: totals only, per-file counts, or per-file patches.
+COMMIT_PROJECTIONS = ("stats", "summary", "full")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for output budgets."""
+    return (len(text) + 3) // 4
+
+
+async def _iterate(items: list) -> AsyncIterator:
+    for item in items:
+        yield item
+
+
+@dataclass
+class ProjectionStats:
+    calls: int = 0
+    raw_tokens: int = 0
+    projected_tokens: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.raw_tokens - self.projected_tokens
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "raw_tokens": self.raw_tokens,
+            "projected_tokens": self.projected_tokens,
+            "tokens_saved": self.tokens_saved,
+        }
+
+
+class GitHubGraphQLError(Exception):
+    """Raised when a GraphQL query returns errors and no data."""
+
+
 class GitHubSettings(BaseModel):
     base_url: str = "https://api.github.com"
     token: str
+    timeout: float = 5
+    http2: bool = False
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30
+    cache_enabled: bool = True
+    cache_ttl: float = 60
+    cache_max_entries: int = 512
+    cache_max_bytes: int = 32 * 1024 * 1024
+    cache_path: str | None = None
+    # Bounds of the on-disk tier at cache_path.
+    cache_disk_max_bytes: int = 256 * 1024 * 1024
+    cache_disk_max_age: float = 7 * 24 * 3600
+    max_concurrency: int = 8
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30
+    rate_limit_reserve: int = 50
+    max_rate_limit_wait: float = 60
+    graphql_path: str = "/graphql"
+    diff_token_budget: int = 4000
+    index_dir: str = ".github-index"
+    index_sync_interval: float = 60
+    index_backfill_days: int | None = 365
+    # Maximum age of cached responses for repositories kept current by webhooks.
+    webhook_ttl: float = 3600
+    warmup_concurrency: int = 4
+    # Also sync the local issue and commit indexes on warmup; the first sync backfills
+    # index_backfill_days of history, which costs many requests on a large repository.
+    warmup_indexes: bool = False
+    # GitHub's secondary limits ask for at least a second between content-creating requests.
+    write_interval: float = 1.0
+    write_concurrency: int = 2
+    # Commits, diffs and blame: "api" uses REST only, "mirror" a local blobless clone, and "auto"
+    # uses the mirror of repositories whose diffs were truncated or over mirror_auto_bytes.
+    git_backend: str = "auto"
+    mirror_dir: str = ".github-mirrors"
+    mirror_url: str = "https://github.com/{owner}/{repo}.git"
+    mirror_fetch_interval: float = 60
+    mirror_auto_bytes: int = 1_000_000
 
 
 class GitHubPlugin:
-    def __init__(self, settings: GitHubSettings):
+    def __init__(self, settings: GitHubSettings, transport: httpx.AsyncBaseTransport | None = None):
         self.settings = settings
+        # Optional transport for the pooled client, e.g. an ``httpx.MockTransport`` in benchmarks.
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._client_lock = threading.Lock()
+        self.cache: ResponseCache | None = None
+        if settings.cache_enabled:
+            self.cache = ResponseCache(
+                ttl=settings.cache_ttl,
+                max_entries=settings.cache_max_entries,
+                max_bytes=settings.cache_max_bytes,
+                path=settings.cache_path,
+                disk_max_bytes=settings.cache_disk_max_bytes,
+                disk_max_age=settings.cache_disk_max_age,
+            )
+        self.scheduler = RequestScheduler(
+            max_concurrency=settings.max_concurrency,
+            max_retries=settings.max_retries,
+            backoff_base=settings.backoff_base,
+            backoff_max=settings.backoff_max,
+            reserve=settings.rate_limit_reserve,
+            max_wait=settings.max_rate_limit_wait,
+        )
+        self.projection_stats = ProjectionStats()
+        self.single_flight = SingleFlight()
+        self._indexes: dict[str, RepoIndex] = {}
+        self._search_indexes: dict[str, SearchIndex] = {}
+        self._index_locks: dict[str, asyncio.Lock] = {}
+        # Cache keys are scoped per token so a shared on-disk tier never leaks private data.
+        self._cache_scope = hashlib.sha256(settings.token.encode()).hexdigest()[:16]
+        # "owner/repo" -> when webhook deliveries for it started being applied.
+        self._webhook_coverage: dict[str, float] = {}
+        self._next_write = 0.0
+        self._mirrors: dict[str, GitMirror] = {}
+        self._mirror_clones: dict[str, asyncio.Task] = {}
+
+    async def __aenter__(self) -> "GitHubPlugin":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def start(self) -> None:
+        """Open the shared connection pool (idempotent)."""
+        await self.get_client()
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool and release its connections."""
+        with self._client_lock:
+            client, self._client, self._client_loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def get_index(self, organization: str, repo: str) -> RepoIndex:
+        """Return the local index of a repository, opening it on first use."""
+        key = f"{organization}/{repo}".lower()
+        with self._client_lock:
+            if key not in self._indexes:
+                self._indexes[key] = RepoIndex.open(self.settings.index_dir, organization, repo)
+            return self._indexes[key]
+
+    def get_search_index(self, organization: str, repo: str, resource: str) -> SearchIndex:
+        """Return the search index of a repository's "issues" or "commits", opening it on first use."""
+        key = f"{organization}/{repo}/{resource}".lower()
+        with self._client_lock:
+            if key not in self._search_indexes:
+                self._search_indexes[key] = SearchIndex.open(self.settings.index_dir, organization, repo, resource)
+            return self._search_indexes[key]
+
+    def index_lock(self, organization: str, repo: str, resource: str) -> asyncio.Lock:
+        """
+        Return the lock guarding writes to a repository's "issues" or "commits" index.
+
+        :meth:`sync_index` holds it for the whole sync; anything else updating the index or its
+        search index, like webhook deliveries, takes it so the two never interleave.
+        """
+        return self._index_locks.setdefault(f"{organization}/{repo}/{resource}".lower(), asyncio.Lock())
+
+    def get_mirror(self, organization: str, repo: str) -> GitMirror:
+        """Return the local git mirror of a repository; it is cloned by its first ``update``."""
+        key = f"{organization}/{repo}".lower()
+        with self._client_lock:
+            if key not in self._mirrors:
+                self._mirrors[key] = GitMirror(
+                    os.path.join(self.settings.mirror_dir, f"{organization}__{repo}.git".lower()),
+                    self.settings.mirror_url.format(owner=organization, repo=repo),
+                    token=self.settings.token or None,
+                    web_url=f"https://github.com/{organization}/{repo}",
+                )
+            return self._mirrors[key]
+
+    def cover_repository(self, full_name: str) -> None:
+        """
+        Serve cached responses of a repository for up to ``webhook_ttl`` seconds, because webhook
+        deliveries patch or expire them as it changes. Entries stored before coverage started
+        are still revalidated after ``cache_ttl``.
+        """
+        self._webhook_coverage.setdefault(full_name.lower(), time.time())
+
+    def uncover_repository(self, full_name: str | None = None) -> None:
+        """Fall back to ``cache_ttl`` and conditional revalidation, e.g. after a missed delivery."""
+        if full_name is None:
+            self._webhook_coverage.clear()
+        else:
+            self._webhook_coverage.pop(full_name.lower(), None)
+
+    def patch_cached(self, path: str, payload: Any) -> None:
+        """Replace the cached response of ``GET path`` with a representation received out of band."""
+        if self.cache is None:
+            return
+        body = json.dumps(payload).encode()
+        # A synthetic validator: GitHub answers it with a full 200, and it changes with the body.
+        etag = f'W/"hook-{hashlib.sha1(body).hexdigest()[:20]}"'
+        self.cache.put(f"{self._cache_scope}:{request_key('GET', path)}", CachedResponse(body=body, etag=etag))
+
+    def expire_cached(self, pattern: str) -> int:
+        """Mark cached ``GET`` responses whose path matches the glob ``pattern`` for revalidation."""
+        return self.cache.expire(f"{self._cache_scope}:GET {pattern}") if self.cache else 0
+
+    def _is_fresh(self, path: str, cached: CachedResponse) -> bool:
+        if cached.is_fresh(self.cache.ttl):
+            return True
+        match = _REPO_PATH.match(path)
+        covered_since = self._webhook_coverage.get(match.group(1).lower()) if match else None
+        return covered_since is not None and cached.stored_at >= covered_since and cached.is_fresh(
+            self.settings.webhook_ttl
+        )
+
+    def cache_stats(self) -> dict:
+        """Hit / miss / revalidation counters of the response cache."""
+        return self.cache.stats.as_dict() if self.cache else {}
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """
+        Return the long-lived client, creating it on first use.
+
+        httpx pools are bound to the event loop they were opened on, so a call from a
+        different loop (e.g. a fresh ``asyncio.run``) gets a new pool instead of a broken one.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._client
+        if client is not None and not client.is_closed and self._client_loop is loop:
+            return client
+        with self._client_lock:
+            if self._client is None or self._client.is_closed or self._client_loop is not loop:
+                self._client = self.create_client()
+                self._client_loop = loop
+            return self._client
 
     @kernel_function
     async def get_user_profile(self) -> "User":
-        async with self.create_client() as client:
-            response = await self.make_request(client, "/user")
-            return User(**response)
+        return await self.make_request("/user", USER)
 
     @kernel_function
     async def get_repository(self, organization: str, repo: str) -> "Repo":
-        async with self.create_client() as client:
-            response = await self.make_request(client, f"/repos/{organization}/{repo}")
-            return Repo(**response)
+        return await self.make_request(f"/repos/{organization}/{repo}", REPO)
 
     @kernel_function
     async def get_issues(
@@ -79,14 +442,10 @@ class GitHubPlugin:
         label: str = "",
         assignee: str = "",
     ) -> list["Issue"]:
-        async with self.create_client() as client:
-            path = f"/repos/{organization}/{repo}/issues?"
-            path = self.build_query(path, "state", state)
-            path = self.build_query(path, "assignee", assignee)
-            path = self.build_query(path, "labels", label)
-            path = self.build_query(path, "per_page", str(max_results) if max_results else "")
-            response = await self.make_request(client, path)
-            return [Issue(**issue) for issue in response]
+        issues = self.iter_issues(
+            organization, repo, max_results or DEFAULT_MAX_RESULTS, state=state, label=label, assignee=assignee
+        )
+        return [issue async for issue in issues]
     
     @kernel_function
     async def get_commits(
@@ -97,7 +456,8 @@ class GitHubPlugin:
         author: str = "",
         since: str = "",
         until: str = "",
-    ) -> list[dict]:
+        backend: str = "",
+    ) -> list["CommitSummary"]:
         """
         Retrieve commits from a GitHub repository.
 
@@ -105,21 +465,123 @@ class GitHubPlugin:
             organization (str): The organization or user name.
             repo (str): The repository name.
             max_results (int, optional): Maximum number of commits to return.
-            author (str, optional): Filter by commit author.
+            author (str, optional): Filter by commit author: a GitHub login or an email address. The
+                "mirror" backend matches it against author names and emails instead of logins.
             since (str, optional): Only commits after this date (ISO 8601).
             until (str, optional): Only commits before this date (ISO 8601).
+            backend (str, optional): "api" or "mirror" (a local clone); empty uses the configured default.
 
         Returns:
-            list[dict]: A list of commit data dictionaries.
-        """
-        async with self.create_client() as client:
-            path = f"/repos/{organization}/{repo}/commits?"
-            path = self.build_query(path, "author", author)
-            path = self.build_query(path, "since", since)
-            path = self.build_query(path, "until", until)
-            path = self.build_query(path, "per_page", str(max_results) if max_results else "")
-            response = await self.make_request(client, path)
-            return response
+            list[CommitSummary]: The commits with sha, author, date and subject line.
+        """
+        max_results = max_results or DEFAULT_MAX_RESULTS
+        use_mirror = self._use_mirror(organization, repo, backend)
+        if use_mirror and author and "@" not in author and (backend or self.settings.git_backend) == "auto":
+            # git log --author matches names and emails, not logins: keep login filters on the API in "auto".
+            use_mirror = False
+        if use_mirror:
+            mirror = await self._updated_mirror(organization, repo)
+            commits = await mirror.log(max_count=max_results, author=author, since=since, until=until)
+        else:
+            commits = self.iter_commits(organization, repo, max_results, author=author, since=since, until=until)
+            commits = [commit async for commit in commits]
+        raw_tokens, summaries = 0, []
+        for commit in commits:
+            raw_tokens += estimate_tokens(json.dumps(commit))
+            summaries.append(CommitSummary.model_validate(commit))
+        self._record_projection(raw_tokens, sum(estimate_tokens(c.model_dump_json()) for c in summaries))
+        return summaries
+
+    async def iter_issues(
+        self,
+        organization: str,
+        repo: str,
+        max_results: int | None = None,
+        state: str = "",
+        label: str = "",
+        assignee: str = "",
+    ) -> AsyncIterator[Issue]:
+        """
+        Stream issues across all pages, one parsed ``Issue`` at a time.
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            max_results (int, optional): Stop after this many issues; ``None`` walks every page.
+            state (str, optional): Filter by state (open, closed, all).
+            label (str, optional): Filter by comma separated label names.
+            assignee (str, optional): Filter by assignee login.
+        """
+        path = f"/repos/{organization}/{repo}/issues?"
+        path = self.build_query(path, "state", state)
+        path = self.build_query(path, "assignee", assignee)
+        path = self.build_query(path, "labels", label)
+        async for issue in self.paginate(path, max_results, ISSUE_PAGE):
+            yield issue
+
+    async def iter_commits(
+        self,
+        organization: str,
+        repo: str,
+        max_results: int | None = None,
+        author: str = "",
+        since: str = "",
+        until: str = "",
+        file_path: str = "",
+    ) -> AsyncIterator[dict]:
+        """
+        Stream commits across all pages, newest first, one record at a time.
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            max_results (int, optional): Stop after this many commits; ``None`` walks the whole history.
+            author (str, optional): Filter by commit author.
+            since (str, optional): Only commits after this date (ISO 8601).
+            until (str, optional): Only commits before this date (ISO 8601).
+            file_path (str, optional): Only commits touching this file.
+        """
+        path = f"/repos/{organization}/{repo}/commits?"
+        path = self.build_query(path, "author", author)
+        path = self.build_query(path, "since", since)
+        path = self.build_query(path, "until", until)
+        path = self.build_query(path, "path", file_path)
+        async for commit in self.paginate(path, max_results):
+            yield commit
+
+    async def paginate(
+        self, path: str, max_results: int | None = None, decoder: TypeAdapter | None = None
+    ) -> AsyncIterator[Any]:
+        """
+        Yield the items of a list endpoint, following ``Link: rel="next"`` headers.
+
+        The next page is requested while the current one is being consumed, and no further page
+        is requested once ``max_results`` items have been produced.
+
+        Args:
+            path (str): The endpoint path, built with ``build_query``.
+            max_results (int, optional): Maximum number of items to yield.
+            decoder (TypeAdapter, optional): Validates each page into a list of models; pages are
+                decoded to dicts without one.
+        """
+        per_page = min(max_results, MAX_PER_PAGE) if max_results else MAX_PER_PAGE
+        path = self.build_query(path, "per_page", str(per_page))
+        remaining = max_results
+        pending: asyncio.Task | None = asyncio.ensure_future(self.get_page(path, decoder))
+        try:
+            while pending is not None:
+                items, next_path = await pending
+                pending = None
+                if remaining is not None:
+                    items = items[:remaining]
+                    remaining -= len(items)
+                if next_path and items and (remaining is None or remaining > 0):
+                    pending = asyncio.ensure_future(self.get_page(next_path, decoder))
+                for item in items:
+                    yield item
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
         
     @kernel_function
     async def get_commit_detail(
@@ -127,7 +589,10 @@ class GitHubPlugin:
         organization: str,
         repo: str,
         commit_sha: str,
-    ) -> dict:
+        projection: str = "summary",
+        max_tokens: int | None = None,
+        backend: str = "",
+    ) -> "CommitDetail":
         """
         Retrieve details for a specific commit in a GitHub repository.
 
@@ -135,14 +600,24 @@ class GitHubPlugin:
             organization (str): The organization or user name.
             repo (str): The repository name.
             commit_sha (str): The commit SHA.
+            projection (str, optional): "stats" for totals only, "summary" for per-file counts,
+                "full" to include patches.
+            max_tokens (int, optional): Output token budget; the largest patches are cut first, then
+                files from the end of the list, which marks the result truncated.
+            backend (str, optional): "api" or "mirror" (a local clone); empty uses the configured default.
 
         Returns:
-            dict: The commit details.
+            CommitDetail: The commit details.
         """
-        async with self.create_client() as client:
-            path = f"/repos/{organization}/{repo}/commits/{commit_sha}"
-            response = await self.make_request(client, path)
-            return response
+        if self._use_mirror(organization, repo, backend):
+            response = await (await self._updated_mirror(organization, repo)).commit(commit_sha)
+        else:
+            response = await self.make_request(f"/repos/{organization}/{repo}/commits/{commit_sha}")
+            if self._outgrows_api(organization, repo, backend, response):
+                commit = lambda mirror: mirror.commit(commit_sha)
+                response = await self._mirror_or_truncated(organization, repo, response, commit)
+        detail = CommitDetail.model_validate(response)
+        return self._project(detail, response, response.get("files") or [], projection, max_tokens)
         
     @kernel_function
     async def get_commit_diff(
@@ -151,7 +626,10 @@ class GitHubPlugin:
         repo: str,
         base_commit: str,
         head_commit: str,
-    ) -> dict:
+        projection: str = "summary",
+        max_tokens: int | None = None,
+        backend: str = "",
+    ) -> "Comparison":
         """
         Retrieve the diff (code changes) between two commits in a GitHub repository.
 
@@ -160,14 +638,199 @@ class GitHubPlugin:
             repo (str): The repository name.
             base_commit (str): The base commit SHA.
             head_commit (str): The head commit SHA.
+            projection (str, optional): "stats" for totals only, "summary" for per-file counts,
+                "full" to include patches.
+            max_tokens (int, optional): Output token budget; the largest patches are cut first, then
+                files from the end of the list, which marks the result truncated.
+            backend (str, optional): "api" or "mirror" (a local clone); empty uses the configured default.
+
+        Returns:
+            Comparison: The comparison result including files changed, commits, and diff stats.
+        """
+        if self._use_mirror(organization, repo, backend):
+            response = await (await self._updated_mirror(organization, repo)).compare(base_commit, head_commit)
+        else:
+            response = await self.make_request(f"/repos/{organization}/{repo}/compare/{base_commit}...{head_commit}")
+            if self._outgrows_api(organization, repo, backend, response):
+                compare = lambda mirror: mirror.compare(base_commit, head_commit)
+                response = await self._mirror_or_truncated(organization, repo, response, compare)
+        files = response.get("files") or []
+        comparison = Comparison.model_validate(response)
+        comparison.stats = CommitStats(
+            additions=sum(f.get("additions", 0) for f in files),
+            deletions=sum(f.get("deletions", 0) for f in files),
+            total=sum(f.get("changes", 0) for f in files),
+        )
+        return self._project(comparison, response, files, projection, max_tokens)
+
+    @kernel_function
+    async def get_file_history(
+        self, organization: str, repo: str, file_path: str, max_results: int | None = None, backend: str = ""
+    ) -> list["CommitSummary"]:
+        """
+        Retrieve the commits that changed a file, newest first.
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            file_path (str): Path of the file in the repository.
+            max_results (int, optional): Maximum number of commits to return.
+            backend (str, optional): "api" or "mirror" (a local clone, which also follows renames);
+                empty uses the configured default.
 
         Returns:
-            dict: The comparison result including files changed, commits, and diff stats.
+            list[CommitSummary]: The commits with sha, author, date and subject line.
         """
-        async with self.create_client() as client:
-            path = f"/repos/{organization}/{repo}/compare/{base_commit}...{head_commit}"
-            response = await self.make_request(client, path)
-            return response
+        max_results = max_results or DEFAULT_MAX_RESULTS
+        if self._use_mirror(organization, repo, backend):
+            mirror = await self._updated_mirror(organization, repo)
+            commits = await mirror.log(max_count=max_results, path=file_path)
+        else:
+            commits = [c async for c in self.iter_commits(organization, repo, max_results, file_path=file_path)]
+        return [CommitSummary.model_validate(commit) for commit in commits]
+
+    @kernel_function
+    async def get_blame(
+        self,
+        organization: str,
+        repo: str,
+        file_path: str,
+        ref: str = "HEAD",
+        start_line: int = 1,
+        end_line: int | None = None,
+    ) -> list["BlameRange"]:
+        """
+        Show which commit last changed each line of a file. Runs on the local mirror, which is
+        cloned on first use.
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            file_path (str): Path of the file in the repository.
+            ref (str, optional): Branch, tag or commit SHA to blame at.
+            start_line (int, optional): First line to include.
+            end_line (int, optional): Last line to include; defaults to 200 lines from start_line.
+
+        Returns:
+            list[BlameRange]: Consecutive lines last changed by the same commit, with its sha,
+                author, date and summary.
+        """
+        mirror = await self._updated_mirror(organization, repo)
+        ranges = await mirror.blame(file_path, ref or "HEAD", start_line, end_line or start_line + 199)
+        return [BlameRange.model_validate(r) for r in ranges]
+
+    def _use_mirror(self, organization: str, repo: str, backend: str) -> bool:
+        backend = backend or self.settings.git_backend
+        if backend == "auto":
+            return self.get_mirror(organization, repo).exists()
+        return backend == "mirror"
+
+    async def _updated_mirror(self, organization: str, repo: str) -> GitMirror:
+        # Mirror reads have no ETag either.
+        self._track(f"/repos/{organization}/{repo}.git", None)
+        mirror = self.get_mirror(organization, repo)
+        await mirror.update(self.settings.mirror_fetch_interval)
+        return mirror
+
+    def _outgrows_api(self, organization: str, repo: str, backend: str, response: dict) -> bool:
+        """
+        In "auto" mode, move a repository to the local mirror once a commit or compare response
+        is truncated or its patches exceed ``mirror_auto_bytes``. Returns True if the response was
+        truncated: the caller then answers from the mirror, which is cloned first. A complete but
+        large response is kept, and the mirror is cloned in the background for the next call.
+        """
+        if (backend or self.settings.git_backend) != "auto":
+            return False
+        files = response.get("files") or []
+        truncated = len(files) >= MAX_API_FILES or response.get("total_commits", 0) > len(response.get("commits", []))
+        if truncated:
+            return True
+        if sum(len(f.get("patch") or "") for f in files) >= self.settings.mirror_auto_bytes:
+            key = f"{organization}/{repo}".lower()
+            if key not in self._mirror_clones:
+                # Cloned outside the turn's tracking: this answer still comes from the API.
+                mirror = self.get_mirror(organization, repo)
+                task = asyncio.ensure_future(mirror.update(self.settings.mirror_fetch_interval))
+                self._mirror_clones[key] = task
+
+                def forget_failed(task: asyncio.Task) -> None:
+                    # A failed clone is retried by the next large response.
+                    if task.cancelled() or task.exception() is not None:
+                        self._mirror_clones.pop(key, None)
+
+                task.add_done_callback(forget_failed)
+        return False
+
+    async def _mirror_or_truncated(self, organization: str, repo: str, response: dict, query) -> dict:
+        """
+        Answer a truncated API response from the mirror. If the mirror cannot be cloned or
+        fetched (no git binary, no access, no network), the API response is still usable and is
+        returned marked as truncated, so "auto" is never less available than "api".
+        """
+        try:
+            return await query(await self._updated_mirror(organization, repo))
+        except (GitMirrorError, OSError):
+            return {**response, "truncated": True}
+
+    def _project(
+        self,
+        model: "CommitDetail | Comparison",
+        raw: dict,
+        files: list[dict],
+        projection: str,
+        max_tokens: int | None,
+    ) -> "CommitDetail | Comparison":
+        """Attach the file list for a projection, fit it into the token budget and record the savings."""
+        if projection not in COMMIT_PROJECTIONS:
+            projection = "summary"
+        max_tokens = max_tokens or self.settings.diff_token_budget
+        model.files_changed = len(files)
+        model.files = None
+        if projection != "stats":
+            model.files = [CommitFile.model_validate(f) for f in files]
+            if projection == "summary":
+                for file in model.files:
+                    file.patch = None
+            else:
+                self._fit_patches(model, max_tokens)
+            self._fit_files(model, max_tokens)
+        raw_tokens, projected_tokens = estimate_tokens(json.dumps(raw)), estimate_tokens(model.model_dump_json())
+        model.tokens_saved = max(0, raw_tokens - projected_tokens)
+        self._record_projection(raw_tokens, projected_tokens)
+        return model
+
+    @staticmethod
+    def _fit_patches(model: "CommitDetail | Comparison", max_tokens: int) -> None:
+        """Truncate, then drop, the largest patches until the serialized model fits ``max_tokens``."""
+        overage = estimate_tokens(model.model_dump_json()) - max_tokens
+        for file in sorted(model.files, key=lambda f: len(f.patch or ""), reverse=True):
+            if overage <= 0 or not file.patch:
+                break
+            keep = len(file.patch) - overage * 4
+            # A patch cut down to a few lines is noise; elide it entirely instead.
+            if keep < 200:
+                overage -= estimate_tokens(file.patch)
+                file.patch = None
+            else:
+                overage -= estimate_tokens(file.patch) - estimate_tokens(file.patch[:keep])
+                file.patch = file.patch[:keep]
+            file.patch_truncated = True
+
+    @staticmethod
+    def _fit_files(model: "CommitDetail | Comparison", max_tokens: int) -> None:
+        """Drop files from the end of the list until the serialized model fits ``max_tokens``."""
+        overage = estimate_tokens(model.model_dump_json()) - max_tokens
+        if overage <= 0:
+            return
+        files = model.files
+        while files and overage > 0:
+            overage -= estimate_tokens(files.pop().model_dump_json())
+        model.truncated = True
+
+    def _record_projection(self, raw_tokens: int, projected_tokens: int) -> None:
+        self.projection_stats.calls += 1
+        self.projection_stats.raw_tokens += raw_tokens
+        self.projection_stats.projected_tokens += projected_tokens
         
     @kernel_function
     async def create_git_issue_with_labels(
@@ -191,20 +854,437 @@ class GitHubPlugin:
         Returns:
             dict: The created issue details.
         """
-        async with self.create_client() as client:
-            path = f"/repos/{organization}/{repo}/issues"
-            payload = {"title": title, "body": body, "labels": labels}
-            print(f"POST REQUEST: {path}\nPayload: {payload}")
-            response = await client.post(path, json=payload)
-            response.raise_for_status()
-            return response.json()
+        return await self.create_issue(organization, repo, title, body, labels)
+
+    async def create_issue(
+        self, organization: str, repo: str, title: str, body: str = "", labels: list[str] | None = None
+    ) -> dict:
+        """Create an issue and return GitHub's representation of it."""
+        response = await self.post(
+            f"/repos/{organization}/{repo}/issues", {"title": title, "body": body, "labels": labels or []}
+        )
+        response.raise_for_status()
+        # Listings of the repository no longer include every issue.
+        self.expire_cached(f"/repos/{organization}/{repo}/issues*")
+        return response.json()
+
+    async def get_labels(self, organization: str, repo: str) -> list[dict]:
+        """Every label defined in a repository."""
+        return [label async for label in self.paginate(f"/repos/{organization}/{repo}/labels?")]
+
+    async def create_label(
+        self, organization: str, repo: str, name: str, color: str = "ededed", description: str = ""
+    ) -> dict | None:
+        """Create a label; returns None if a label with that name already exists."""
+        payload = {"name": name, "color": color, "description": description}
+        response = await self.post(f"/repos/{organization}/{repo}/labels", payload)
+        if response.status_code == 422 and "already_exists" in response.text:
+            return None
+        response.raise_for_status()
+        self.expire_cached(f"/repos/{organization}/{repo}/labels*")
+        return response.json()
+
+    async def post(self, path: str, payload: dict) -> httpx.Response:
+        """
+        POST a content-creating request, at most one every ``write_interval`` seconds across all
+        callers. Writes are never retried after a server error, only when GitHub throttled them.
+        """
+        self._track(path, None)
+        now = time.monotonic()
+        slot = max(now, self._next_write)
+        self._next_write = slot + self.settings.write_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        client = await self.get_client()
+        with self._request_span("POST", path) as span:
+            response = await self.scheduler.send(lambda: client.post(path, json=payload), idempotent=False)
+            self._annotate(span, response)
+        return response
 
     @kernel_function
     async def get_issue_detail(self, organization: str, repo: str, issue_id: int) -> "IssueDetail":
-        async with self.create_client() as client:
-            path = f"/repos/{organization}/{repo}/issues/{issue_id}"
-            response = await self.make_request(client, path)
-            return IssueDetail(**response)
+        path = f"/repos/{organization}/{repo}/issues/{issue_id}"
+        return await self.make_request(path, ISSUE_DETAIL)
+
+    @kernel_function
+    async def get_issue_details(self, organization: str, repo: str, issue_ids: list[int]) -> list["IssueDetail"]:
+        """
+        Retrieve the details of several issues or pull requests in a single call.
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            issue_ids (list[int]): The issue or pull request numbers.
+
+        Returns:
+            list[IssueDetail]: The details of the issues that exist, in the requested order.
+        """
+        return await self.fetch_issue_details(organization, repo, issue_ids)
+
+    @kernel_function
+    async def query_commits(
+        self,
+        organization: str,
+        repo: str,
+        author: str = "",
+        since: str = "",
+        until: str = "",
+        max_results: int | None = None,
+    ) -> list[dict]:
+        """
+        Answer commit questions from the local index, fetching only commits newer than the last sync.
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            author (str, optional): Filter by author login, name or email.
+            since (str, optional): Only commits after this date (ISO 8601).
+            until (str, optional): Only commits before this date (ISO 8601).
+            max_results (int, optional): Maximum number of commits to return.
+
+        Returns:
+            list[dict]: Commits newest first with sha, author, dates and message.
+        """
+        await self.sync_index(organization, repo, "commits")
+        index = self.get_index(organization, repo)
+        return index.query_commits(author, since, until, max_results or DEFAULT_MAX_RESULTS)
+
+    @kernel_function
+    async def query_issues(
+        self,
+        organization: str,
+        repo: str,
+        state: str = "",
+        label: str = "",
+        author: str = "",
+        since: str = "",
+        until: str = "",
+        max_results: int | None = None,
+    ) -> list[dict]:
+        """
+        Answer issue questions from the local index, fetching only issues updated since the last sync.
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            state (str, optional): Filter by state (open, closed, all).
+            label (str, optional): Filter by label name.
+            author (str, optional): Filter by the login of the issue author.
+            since (str, optional): Only issues created after this date (ISO 8601).
+            until (str, optional): Only issues created before this date (ISO 8601).
+            max_results (int, optional): Maximum number of issues to return.
+
+        Returns:
+            list[dict]: Issues newest first with number, title, state, labels and dates.
+        """
+        await self.sync_index(organization, repo, "issues")
+        index = self.get_index(organization, repo)
+        return index.query_issues(state, label, author, since, until, limit=max_results or DEFAULT_MAX_RESULTS)
+
+    @kernel_function
+    async def get_top_committers(
+        self,
+        organization: str,
+        repo: str,
+        since: str = "",
+        until: str = "",
+        max_results: int = 10,
+    ) -> list[dict]:
+        """
+        Count commits per author from the local index, e.g. to find who committed most last quarter.
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            since (str, optional): Only commits after this date (ISO 8601).
+            until (str, optional): Only commits before this date (ISO 8601).
+            max_results (int, optional): Number of authors to return.
+
+        Returns:
+            list[dict]: Authors with their commit counts, busiest first.
+        """
+        await self.sync_index(organization, repo, "commits")
+        return self.get_index(organization, repo).top_committers(since, until, max_results)
+
+    @kernel_function
+    async def search_issues(
+        self, organization: str, repo: str, query: str, max_results: int = 5, state: str = ""
+    ) -> list[dict]:
+        """
+        Find the issues and pull requests most relevant to a free-text query, e.g. "is there an issue about X?".
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            query (str): Words describing what to look for.
+            max_results (int, optional): Maximum number of hits to return.
+            state (str, optional): Filter by state (open, closed, all).
+
+        Returns:
+            list[dict]: The best matching issues with number, title, state, labels and a relevance score.
+        """
+        search = await self._synced_search_index(organization, repo, "issues")
+        hits = search.search(query, max_results * 4 if state and state != "all" else max_results)
+        rows = self.get_index(organization, repo).get_issues([int(key) for key, _ in hits])
+        results = []
+        for key, score in hits:
+            row = rows.get(int(key))
+            if row is None or (state and state != "all" and row["state"] != state):
+                continue
+            results.append(
+                {
+                    "number": row["number"],
+                    "title": row["title"],
+                    "state": row["state"],
+                    "is_pull_request": bool(row["is_pull_request"]),
+                    "labels": [label["name"] for label in row["labels"]],
+                    "url": row["url"],
+                    "score": round(score, 3),
+                }
+            )
+            if len(results) == max_results:
+                break
+        return results
+
+    @kernel_function
+    async def search_commits(self, organization: str, repo: str, query: str, max_results: int = 5) -> list[dict]:
+        """
+        Find the commits whose messages are most relevant to a free-text query.
+
+        Args:
+            organization (str): The organization or user name.
+            repo (str): The repository name.
+            query (str): Words describing what to look for.
+            max_results (int, optional): Maximum number of hits to return.
+
+        Returns:
+            list[dict]: The best matching commits with sha, author, date, subject line and a relevance score.
+        """
+        search = await self._synced_search_index(organization, repo, "commits")
+        hits = search.search(query, max_results)
+        rows = self.get_index(organization, repo).get_commits([key for key, _ in hits])
+        return [
+            {
+                "sha": key,
+                "author": rows[key]["author_login"] or rows[key]["author_name"],
+                "date": rows[key]["committed_at"],
+                "message": rows[key]["message"].split("\n", 1)[0],
+                "score": round(score, 3),
+            }
+            for key, score in hits
+            if key in rows
+        ]
+
+    async def _synced_search_index(self, organization: str, repo: str, resource: str) -> SearchIndex:
+        search = self.get_search_index(organization, repo, resource)
+        index = self.get_index(organization, repo)
+        # An index synced before the search index existed has no documents to search; backfill it once.
+        # The flag, not the document count, records the backfill: a repository may have nothing to index.
+        if index.is_backfilled(f"search:{resource}") and search.version is not None:
+            await self.sync_index(organization, repo, resource)
+            return search
+        index.reset_watermark(resource)
+        await self.sync_index(organization, repo, resource, force=True)
+        await asyncio.to_thread(search.save)
+        index.mark_backfilled(f"search:{resource}")
+        return search
+
+    async def sync_index(self, organization: str, repo: str, resource: str, force: bool = False) -> int:
+        """
+        Bring one resource ("commits" or "issues") of the local index up to date.
+
+        Only issues updated since the stored ``since`` watermark are requested. Commits merged from
+        a long-lived branch keep their older committer dates, so the watermark of commits is the
+        default branch head of the last sync instead, and new commits are those of a compare from
+        it to the default branch. Without a stored head, or when the compare fails, commits are
+        listed from the backfill horizon. Nothing is requested at all if the resource was synced
+        less than ``index_sync_interval`` seconds ago.
+
+        Returns:
+            int: The number of items fetched from GitHub.
+        """
+        # What a turn reads from the local index has no ETag, so its answer cannot be revalidated.
+        self._track(f"/repos/{organization}/{repo}/{resource}", None)
+        async with self.index_lock(organization, repo, resource):
+            index = self.get_index(organization, repo)
+            watermark, synced_at = index.watermark(resource)
+            if not force and time.time() - synced_at < self.settings.index_sync_interval:
+                return 0
+            search = self.get_search_index(organization, repo, resource)
+            if resource == "commits":
+                head = watermark if watermark and _COMMIT_SHA.fullmatch(watermark) else None
+                compared = await self._commits_after(organization, repo, head) if head else None
+                if compared is not None:
+                    items, watermark = _iterate(compared[0]), compared[1]
+                else:
+                    # No head yet (first sync, or reset after a force push) or it cannot be compared: walk the window.
+                    items, watermark = self.iter_commits(organization, repo, since=self._backfill_since()), None
+                # The walk lists newest first, so its first commit is the new head; a compare returned it already.
+                advance = lambda commit: watermark or commit["sha"]
+
+                def store(batch: list[dict]) -> None:
+                    index.upsert_commits(batch)
+                    search.add([c["sha"] for c in batch], [c["commit"]["message"] for c in batch])
+
+            else:
+                since = watermark or self._backfill_since()
+                path = f"/repos/{organization}/{repo}/issues?state=all&sort=updated&direction=asc&"
+                items = self.paginate(self.build_query(path, "since", since))
+                watermark = watermark or since
+                advance = lambda issue: max(watermark, issue["updated_at"])
+
+                def store(batch: list[dict]) -> None:
+                    index.upsert_issues(batch)
+                    texts = [f"{issue['title']}\n{issue.get('body') or ''}" for issue in batch]
+                    search.add([str(issue["number"]) for issue in batch], texts)
+
+            fetched, batch = 0, []
+            async for item in items:
+                batch.append(item)
+                watermark = advance(item)
+                if len(batch) >= MAX_PER_PAGE * 5:
+                    store(batch)
+                    fetched, batch = fetched + len(batch), []
+            if batch:
+                store(batch)
+                fetched += len(batch)
+            if fetched:
+                # Rewriting the arrays is blocking file I/O; keep it off the event loop.
+                await asyncio.to_thread(search.save)
+            # The watermark only moves once the whole delta is stored, so a failed sync is retried.
+            index.set_watermark(resource, watermark)
+            return fetched
+
+    async def _commits_after(self, organization: str, repo: str, head: str) -> tuple[list[dict], str] | None:
+        """
+        Commits of the default branch after ``head``, oldest first, and the current head.
+
+        Returns ``None`` when ``head`` cannot be compared: it is gone, or no longer an ancestor.
+        """
+        repository, _ = await self.get_page(f"/repos/{organization}/{repo}")
+        path = f"/repos/{organization}/{repo}/compare/{head}...{repository['default_branch']}?per_page={MAX_PER_PAGE}"
+        try:
+            comparison, next_path = await self.get_page(path)
+        except httpx.HTTPStatusError:
+            return None
+        if comparison.get("status") not in ("ahead", "identical"):
+            return None
+        commits = comparison["commits"]
+        while next_path:
+            comparison, next_path = await self.get_page(next_path)
+            commits += comparison["commits"]
+        return commits, commits[-1]["sha"] if commits else head
+
+    async def warm_up(self, organization: str, repo: str) -> dict[str, str]:
+        """
+        Prefetch what a first question about a repository usually needs into the response cache
+        (and, with ``warmup_indexes``, the local indexes), at most ``warmup_concurrency`` at a time.
+        Each prefetch uses the same request as the kernel function it warms, so the agent's calls
+        hit the cache (or join the request still in flight). Cancelling the task stops the remaining prefetches.
+
+        Returns:
+            dict[str, str]: "ok" or the error of each prefetch.
+        """
+        prefetches = {
+            "repository": lambda: self.get_repository(organization, repo),
+            "user": self.get_user_profile,
+            "open_issues": lambda: self.get_issues(organization, repo, state="open"),
+            "issues": lambda: self.get_issues(organization, repo),
+            "commits": lambda: self.get_commits(organization, repo),
+        }
+        if self.settings.warmup_indexes:
+            prefetches["issue_index"] = lambda: self.sync_index(organization, repo, "issues")
+            prefetches["commit_index"] = lambda: self.sync_index(organization, repo, "commits")
+        semaphore = asyncio.Semaphore(self.settings.warmup_concurrency)
+
+        async def prefetch(call) -> str:
+            async with semaphore:
+                try:
+                    await call()
+                    return "ok"
+                except Exception as error:  # cancellation is a BaseException and still stops the warmup
+                    return f"{type(error).__name__}: {error}"
+
+        with tracer.start_as_current_span("github.warmup", attributes={"github.repository": f"{organization}/{repo}"}):
+            results = await asyncio.gather(*(prefetch(call) for call in prefetches.values()))
+        return dict(zip(prefetches, results))
+
+    def _backfill_since(self) -> str:
+        if self.settings.index_backfill_days is None:
+            return ""
+        start = datetime.now(timezone.utc) - timedelta(days=self.settings.index_backfill_days)
+        return start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    async def fetch_issue_details(self, organization: str, repo: str, issue_ids: list[int]) -> list[IssueDetail]:
+        """
+        Resolve many issue numbers with one aliased GraphQL query per ``GRAPHQL_BATCH_SIZE`` numbers.
+
+        Batches whose query fails fall back to concurrent REST calls, bounded by the scheduler.
+        """
+        numbers = list(dict.fromkeys(int(number) for number in issue_ids))
+        batches = [numbers[i : i + GRAPHQL_BATCH_SIZE] for i in range(0, len(numbers), GRAPHQL_BATCH_SIZE)]
+        results = await asyncio.gather(*(self._fetch_issue_batch(organization, repo, batch) for batch in batches))
+        details = {number: detail for batch in results for number, detail in batch.items()}
+        return [details[number] for number in numbers if number in details]
+
+    async def _fetch_issue_batch(self, organization: str, repo: str, numbers: list[int]) -> dict[int, IssueDetail]:
+        try:
+            return await self._graphql_issue_details(organization, repo, numbers)
+        except (httpx.HTTPError, GitHubGraphQLError, KeyError, TypeError):
+            pass
+        responses = await asyncio.gather(
+            *(self.get_issue_detail(organization, repo, number) for number in numbers), return_exceptions=True
+        )
+        details = {}
+        for number, response in zip(numbers, responses):
+            if isinstance(response, httpx.HTTPStatusError) and response.response.status_code == httpx.codes.NOT_FOUND:
+                continue
+            if isinstance(response, BaseException):
+                raise response
+            details[number] = response
+        return details
+
+    async def _graphql_issue_details(self, organization: str, repo: str, numbers: list[int]) -> dict[int, IssueDetail]:
+        aliases = "\n".join(
+            f"i{number}: issueOrPullRequest(number: {number}) {{"
+            f" ... on Issue {{ {_ISSUE_DETAIL_FIELDS} }} ... on PullRequest {{ {_ISSUE_DETAIL_FIELDS} }} }}"
+            for number in numbers
+        )
+        query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {aliases} }} }}"
+        data = await self.graphql(query, {"owner": organization, "name": repo})
+        details = {}
+        for number in numbers:
+            node = data["repository"].get(f"i{number}")
+            if node:
+                details[number] = IssueDetail(
+                    id=node["databaseId"],
+                    number=node["number"],
+                    html_url=node["url"],
+                    title=node["title"],
+                    state=_GRAPHQL_STATES.get(node["state"], node["state"].lower()),
+                    labels=[
+                        Label(name=label["name"], description=label["description"])
+                        for label in node["labels"]["nodes"]
+                    ],
+                    created_at=node["createdAt"],
+                    closed_at=node["closedAt"],
+                    body=node["body"],
+                )
+        return details
+
+    async def graphql(self, query: str, variables: dict | None = None) -> dict:
+        """Run a GraphQL query and return its ``data`` member."""
+        self._track(self.settings.graphql_path, None)
+        client = await self.get_client()
+        payload = {"query": query, "variables": variables or {}}
+        with self._request_span("POST", self.settings.graphql_path) as span:
+            response = await self.scheduler.send(lambda: client.post(self.settings.graphql_path, json=payload))
+            self._annotate(span, response)
+        response.raise_for_status()
+        result = response.json()
+        if not result.get("data"):
+            raise GitHubGraphQLError(result.get("errors"))
+        return result["data"]
 
     def create_client(self) -> httpx.AsyncClient:
         headers = {
@@ -213,7 +1293,21 @@ class GitHubPlugin:
             "Authorization": f"Bearer {self.settings.token}",
             "X-GitHub-Api-Version": "2022-11-28",
         }
-        return httpx.AsyncClient(base_url=self.settings.base_url, headers=headers, timeout=5)
+        limits = httpx.Limits(
+            max_connections=self.settings.max_connections,
+            max_keepalive_connections=self.settings.max_keepalive_connections,
+            keepalive_expiry=self.settings.keepalive_expiry,
+        )
+        # HTTP/2 needs the optional ``h2`` package; fall back to HTTP/1.1 keep-alive without it.
+        http2 = self.settings.http2 and importlib.util.find_spec("h2") is not None
+        return httpx.AsyncClient(
+            base_url=self.settings.base_url,
+            headers=headers,
+            timeout=self.settings.timeout,
+            limits=limits,
+            http2=http2,
+            transport=self.transport,
+        )
 
     @staticmethod
     def build_query(path: str, key: str, value: str) -> str:
@@ -221,9 +1315,93 @@ class GitHubPlugin:
             return f"{path}{key}={value}&"
         return path
 
+    def next_page_path(self, link: str | None) -> str | None:
+        """Extract the ``rel="next"`` target of a Link header, relative to the API base URL."""
+        match = _NEXT_LINK.search(link or "")
+        if match is None:
+            return None
+        url = match.group(1)
+        base_url = self.settings.base_url.rstrip("/")
+        return url[len(base_url):] if url.startswith(base_url) else url
+
+    async def make_request(self, path: str, decoder: TypeAdapter | None = None) -> Any:
+        response, _ = await self.get_page(path, decoder)
+        return response
+
+    async def get_page(self, path: str, decoder: TypeAdapter | None = None) -> tuple[Any, str | None]:
+        """
+        GET ``path`` and return the decoded body with the path of the next page, if any.
+
+        With a ``decoder`` the body is validated from its raw bytes into models; without one it
+        is decoded to plain dicts and lists.
+        """
+        key = request_key("GET", path)
+        body, link = await self.single_flight.do(key, lambda: self._fetch(path, key))
+        if resource_versions.get() is not None:
+            self._track(path, self._version(key))
+        # Each caller decodes its own copy, so coalesced callers never share mutable results.
+        return (decoder.validate_json(body) if decoder else _loads(body)), self.next_page_path(link)
+
+    async def resource_version(self, path: str) -> str | None:
+        """Current ETag (or Last-Modified) of a GET resource, revalidating the cached copy if it is stale."""
+        await self.get_page(path)
+        return self._version(request_key("GET", path))
+
+    def _version(self, key: str) -> str | None:
+        cached = self.cache.get(f"{self._cache_scope}:{key}") if self.cache else None
+        return (cached.etag or cached.last_modified) if cached else None
+
+    @staticmethod
+    def _track(path: str, version: str | None) -> None:
+        versions = resource_versions.get()
+        if versions is not None:
+            versions.append((path, version))
+
+    @staticmethod
+    def _request_span(method: str, path: str):
+        attributes = {"http.request.method": method, "url.path": path, CACHE_OUTCOME: "bypass"}
+        return tracer.start_as_current_span(GITHUB_REQUEST_SPAN, attributes=attributes)
+
     @staticmethod
-    async def make_request(client: httpx.AsyncClient, path: str) -> dict:
-        print(f"REQUEST: {path}\n")
-        response = await client.get(path)
+    def _annotate(span, response: httpx.Response) -> None:
+        span.set_attribute("http.response.status_code", response.status_code)
+        span.set_attribute(RESPONSE_BYTES, len(response.content))
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            span.set_attribute(RATE_LIMIT_REMAINING, int(remaining))
+
+    async def _fetch(self, path: str, key: str) -> tuple[bytes, str | None]:
+        with self._request_span("GET", path) as span:
+            return await self._fetch_cached(path, key, span)
+
+    async def _fetch_cached(self, path: str, key: str, span) -> tuple[bytes, str | None]:
+        key = f"{self._cache_scope}:{key}"
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None and self._is_fresh(path, cached):
+            self.cache.stats.hits += 1
+            span.set_attribute(CACHE_OUTCOME, "hit")
+            return cached.body, cached.link
+
+        client = await self.get_client()
+        headers = cached.validators() if cached else None
+        response = await self.scheduler.send(lambda: client.get(path, headers=headers))
+        self._annotate(span, response)
+        if response.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+            self.cache.stats.revalidations += 1
+            span.set_attribute(CACHE_OUTCOME, "revalidated")
+            self.cache.touch(key, cached)
+            return cached.body, cached.link
+        span.set_attribute(CACHE_OUTCOME, "miss" if self.cache is not None else "bypass")
         response.raise_for_status()
-        return response.json()
\ No newline at end of file
+
+        link = response.headers.get("Link")
+        if self.cache is not None:
+            self.cache.stats.misses += 1
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.cache.put(
+                    key,
+                    CachedResponse(body=response.content, etag=etag, last_modified=last_modified, link=link),
+                )
+        return response.content, link
\ No newline at end of file
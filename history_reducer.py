@@ -0,0 +1,187 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Pluggable strategies that bound the chat history sent to the agent on every turn."""
+
+import logging
+from abc import ABC, abstractmethod
+
+from semantic_kernel.connectors.ai.chat_completion_client_base import ChatCompletionClientBase
+from semantic_kernel.connectors.ai.prompt_execution_settings import PromptExecutionSettings
+from semantic_kernel.contents.chat_history import ChatHistory
+from semantic_kernel.contents.chat_message_content import ChatMessageContent
+from semantic_kernel.contents.function_result_content import FunctionResultContent
+from semantic_kernel.contents.history_reducer.chat_history_reducer_utils import SUMMARY_METADATA_KEY
+from semantic_kernel.contents.utils.author_role import AuthorRole
+
+from git_plugin import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Per-message overhead of the chat format (role, separators).
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+# Metadata key of the summary text without SUMMARY_PREFIX, so it is never prefixed twice.
+SUMMARY_TEXT_KEY = "summary_text"
+
+SUMMARIZATION_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an assistant that answers "
+    "questions about a GitHub repository. Merge the existing summary with the new messages into one "
+    "concise summary of at most 8 sentences. Keep repository names, issue and pull request numbers, "
+    "commit SHAs, people and any open questions. Do not add information that is not in the input."
+)
+
+
+def message_tokens(message: ChatMessageContent) -> int:
+    return _MESSAGE_OVERHEAD_TOKENS + sum(estimate_tokens(str(item)) for item in message.items)
+
+
+def history_tokens(history: ChatHistory) -> int:
+    """Estimated prompt tokens of a chat history."""
+    return sum(message_tokens(message) for message in history.messages)
+
+
+def is_summary(message: ChatMessageContent) -> bool:
+    return bool(message.metadata.get(SUMMARY_METADATA_KEY))
+
+
+def split_turns(history: ChatHistory) -> tuple[str, list[ChatMessageContent], list[list[ChatMessageContent]]]:
+    """
+    Split a history into its running summary, the messages before the first user message and
+    the turns that follow. A turn starts at a user message and holds every reply and tool
+    message up to the next one.
+    """
+    summary, preamble, turns = "", [], []
+    for message in history.messages:
+        if is_summary(message):
+            summary = message.metadata.get(SUMMARY_TEXT_KEY) or str(message.content).removeprefix(SUMMARY_PREFIX)
+        elif message.role == AuthorRole.USER:
+            turns.append([message])
+        elif turns:
+            turns[-1].append(message)
+        else:
+            preamble.append(message)
+    return summary, preamble, turns
+
+
+class HistoryReducer(ABC):
+    """
+    Returns a bounded copy of a chat history before each ``agent.invoke``.
+
+    Args:
+        keep_turns: Number of most recent turns kept verbatim.
+        max_tokens: Hard ceiling on the estimated prompt tokens of the reduced history.
+        tool_output_chars: Tool results longer than this are clipped in every kept turn.
+    """
+
+    def __init__(self, keep_turns: int = 6, max_tokens: int = 6000, tool_output_chars: int = 2000):
+        self.keep_turns = keep_turns
+        self.max_tokens = max_tokens
+        self.tool_output_chars = tool_output_chars
+
+    @abstractmethod
+    async def reduce(self, history: ChatHistory) -> ChatHistory: ...
+
+    def build(
+        self, summary: str, preamble: list[ChatMessageContent], turns: list[list[ChatMessageContent]]
+    ) -> ChatHistory:
+        """Assemble summary, preamble and turns, then drop the oldest turns until under ``max_tokens``."""
+        turns = [[self.clip_tool_output(message) for message in turn] for turn in turns]
+        head = list(preamble)
+        if summary:
+            head.append(
+                ChatMessageContent(
+                    role=AuthorRole.SYSTEM,
+                    content=f"{SUMMARY_PREFIX}{summary}",
+                    metadata={SUMMARY_METADATA_KEY: True, SUMMARY_TEXT_KEY: summary},
+                )
+            )
+        budget = self.max_tokens - sum(message_tokens(message) for message in head)
+        kept: list[list[ChatMessageContent]] = []
+        # The newest turn is always kept so the question being asked is never dropped.
+        for turn in reversed(turns):
+            cost = sum(message_tokens(message) for message in turn)
+            if kept and cost > budget:
+                break
+            kept.insert(0, turn)
+            budget -= cost
+        return ChatHistory(messages=head + [message for turn in kept for message in turn])
+
+    def clip_tool_output(self, message: ChatMessageContent) -> ChatMessageContent:
+        if not any(
+            isinstance(item, FunctionResultContent) and len(str(item.result)) > self.tool_output_chars
+            for item in message.items
+        ):
+            return message
+        items = [
+            item.model_copy(update={"result": f"{str(item.result)[: self.tool_output_chars]}... [truncated]"})
+            if isinstance(item, FunctionResultContent) and len(str(item.result)) > self.tool_output_chars
+            else item
+            for item in message.items
+        ]
+        return message.model_copy(update={"items": items})
+
+
+class NoopReducer(HistoryReducer):
+    """Sends the full history every turn; the baseline to compare the other strategies with."""
+
+    async def reduce(self, history: ChatHistory) -> ChatHistory:
+        return history
+
+
+class TruncationReducer(HistoryReducer):
+    """Keeps the last ``keep_turns`` turns and forgets everything older."""
+
+    async def reduce(self, history: ChatHistory) -> ChatHistory:
+        summary, preamble, turns = split_turns(history)
+        return self.build(summary, preamble, turns[-self.keep_turns :])
+
+
+class RollingSummaryReducer(HistoryReducer):
+    """
+    Keeps the last ``keep_turns`` turns verbatim and folds older turns into a running summary
+    produced by the chat completion service. If summarization fails the older turns are
+    truncated instead, so a turn is never blocked by the reducer.
+
+    Summarizing is an extra LLM round trip before the answer, so older turns are folded in
+    batches: only once ``summarize_every`` turns beyond ``keep_turns`` have accumulated, or the
+    history is over ``max_tokens``. In between, the history is sent unchanged.
+    """
+
+    def __init__(self, service: ChatCompletionClientBase, summarize_every: int = 4, **kwargs):
+        super().__init__(**kwargs)
+        self.service = service
+        self.summarize_every = max(1, summarize_every)
+
+    async def reduce(self, history: ChatHistory) -> ChatHistory:
+        summary, preamble, turns = split_turns(history)
+        if len(turns) < self.keep_turns + self.summarize_every and history_tokens(history) <= self.max_tokens:
+            return history
+        older, recent = turns[: -self.keep_turns], turns[-self.keep_turns :]
+        if older:
+            try:
+                summary = await self.summarize(summary, [message for turn in older for message in turn])
+            except Exception:
+                logger.exception("Chat history summarization failed; truncating older turns instead.")
+        return self.build(summary, preamble, recent)
+
+    async def summarize(self, summary: str, messages: list[ChatMessageContent]) -> str:
+        clipped = [self.clip_tool_output(message) for message in messages]
+        transcript = "\n".join(
+            f"{message.role.value}: {message.content or ' '.join(map(str, message.items))}" for message in clipped
+        )
+        prompt = ChatHistory(system_message=SUMMARIZATION_PROMPT)
+        prompt.add_user_message(f"Existing summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}")
+        response = await self.service.get_chat_message_content(prompt, PromptExecutionSettings())
+        return str(response.content).strip() if response else summary
+
+
+def create_reducer(
+    strategy: str, service: ChatCompletionClientBase | None = None, summarize_every: int = 4, **kwargs
+) -> HistoryReducer:
+    """Build a reducer by name: "none", "truncate" or "summarize" (falls back to "truncate" without a service)."""
+    if strategy == "none":
+        return NoopReducer(**kwargs)
+    if strategy == "summarize" and service is not None:
+        return RollingSummaryReducer(service, summarize_every=summarize_every, **kwargs)
+    return TruncationReducer(**kwargs)
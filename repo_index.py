@@ -0,0 +1,296 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Local SQLite index of a repository's commits and issues, synced incrementally."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    author_login TEXT,
+    author_name TEXT,
+    author_email TEXT,
+    authored_at TEXT,
+    committed_at TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS commits_committed_at ON commits (committed_at);
+CREATE INDEX IF NOT EXISTS commits_author ON commits (author_login);
+CREATE TABLE IF NOT EXISTS issues (
+    number INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    state TEXT NOT NULL,
+    author_login TEXT,
+    labels TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT,
+    closed_at TEXT,
+    is_pull_request INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS issues_updated_at ON issues (updated_at);
+CREATE TABLE IF NOT EXISTS bulk_journal (
+    fingerprint TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    number INTEGER,
+    url TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class RepoIndex:
+    """
+    One SQLite file per ``owner/repo`` holding commit and issue metadata.
+
+    The index only stores what the filtered queries need; callers sync it from the
+    watermark returned by :meth:`watermark` and upsert the delta.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def open(cls, index_dir: str, organization: str, repo: str) -> "RepoIndex":
+        os.makedirs(index_dir, exist_ok=True)
+        return cls(os.path.join(index_dir, f"{organization}__{repo}.sqlite3".lower()))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # region Sync state
+
+    def watermark(self, resource: str) -> tuple[str | None, float]:
+        """
+        Return the watermark of a resource and when it was last synced: the ``since`` date of
+        issues, or the default branch head of commits.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, synced_at FROM sync_state WHERE resource = ?", (resource,)
+            ).fetchone()
+        return (row["watermark"], row["synced_at"]) if row else (None, 0.0)
+
+    def reset_watermark(self, resource: str) -> None:
+        """Forget the watermark of a resource so the next sync starts from the backfill horizon."""
+        with self._lock:
+            self._conn.execute("DELETE FROM sync_state WHERE resource = ?", (resource,))
+
+    def set_watermark(self, resource: str, watermark: str | None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (resource, watermark, synced_at) VALUES (?, ?, ?)",
+                (resource, watermark, time.time()),
+            )
+
+    def is_backfilled(self, name: str) -> bool:
+        """Whether :meth:`mark_backfilled` was called for ``name``, e.g. "search:issues"."""
+        return self.watermark(f"{name}:backfilled")[1] > 0
+
+    def mark_backfilled(self, name: str) -> None:
+        self.set_watermark(f"{name}:backfilled", None)
+
+    # endregion
+
+    # region Bulk journal
+
+    def journal_entries(self, fingerprints: list[str]) -> dict[str, dict]:
+        """Journal rows of bulk-created issues, by fingerprint."""
+        placeholders = ", ".join("?" * len(fingerprints))
+        rows = self._fetch(f"SELECT * FROM bulk_journal WHERE fingerprint IN ({placeholders})", fingerprints, None)
+        return {row["fingerprint"]: row for row in rows}
+
+    def journal(
+        self, fingerprint: str, title: str, status: str, number: int | None = None, url: str | None = None
+    ) -> None:
+        """Record that an issue is about to be created ("pending") or was "created"."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bulk_journal VALUES (?, ?, ?, ?, ?, ?)",
+                (fingerprint, title, status, number, url, time.time()),
+            )
+
+    def forget(self, fingerprint: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM bulk_journal WHERE fingerprint = ?", (fingerprint,))
+
+    # endregion
+
+    # region Upserts
+
+    def upsert_commits(self, commits: list[dict]) -> None:
+        rows = [
+            (
+                commit["sha"],
+                (commit.get("author") or {}).get("login"),
+                commit["commit"]["author"]["name"],
+                commit["commit"]["author"]["email"],
+                commit["commit"]["author"]["date"],
+                commit["commit"]["committer"]["date"],
+                commit["commit"]["message"],
+            )
+            for commit in commits
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def upsert_issues(self, issues: list[dict]) -> None:
+        rows = [
+            (
+                issue["number"],
+                issue["id"],
+                issue["html_url"],
+                issue["title"],
+                issue["state"],
+                (issue.get("user") or {}).get("login"),
+                json.dumps(
+                    [{"id": l["id"], "name": l["name"], "description": l.get("description")} for l in issue["labels"]]
+                ),
+                issue.get("created_at"),
+                issue.get("updated_at"),
+                issue.get("closed_at"),
+                int("pull_request" in issue),
+            )
+            for issue in issues
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def delete_issues(self, numbers: list[int]) -> None:
+        placeholders = ", ".join("?" * len(numbers))
+        with self._lock:
+            self._conn.execute(f"DELETE FROM issues WHERE number IN ({placeholders})", numbers)
+
+    def update_label(self, name: str, label: dict | None) -> int:
+        """Rename or redescribe the label ``name`` on every issue, or remove it if ``label`` is None."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            rows = self._conn.execute(
+                "SELECT number, labels FROM issues WHERE EXISTS "
+                "(SELECT 1 FROM json_each(issues.labels) WHERE json_extract(value, '$.name') = ? COLLATE NOCASE)",
+                (name,),
+            ).fetchall()
+            for row in rows:
+                labels = [l for l in json.loads(row["labels"]) if l["name"].lower() != name.lower()]
+                if label is not None:
+                    labels.append({"id": label["id"], "name": label["name"], "description": label.get("description")})
+                self._conn.execute("UPDATE issues SET labels = ? WHERE number = ?", (json.dumps(labels), row["number"]))
+        return len(rows)
+
+    # endregion
+
+    # region Queries
+
+    def query_commits(
+        self, author: str = "", since: str = "", until: str = "", limit: int | None = None
+    ) -> list[dict]:
+        """Commits newest first, filtered by author login/name/email and committer date range."""
+        clauses, params = [], []
+        if author:
+            clauses.append("(author_login = ? COLLATE NOCASE OR author_name = ? COLLATE NOCASE OR author_email = ?)")
+            params += [author, author, author]
+        if since:
+            clauses.append("committed_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("committed_at <= ?")
+            params.append(until)
+        sql = "SELECT * FROM commits" + self._where(clauses) + " ORDER BY committed_at DESC"
+        return self._fetch(sql, params, limit)
+
+    def query_issues(
+        self,
+        state: str = "",
+        label: str = "",
+        author: str = "",
+        since: str = "",
+        until: str = "",
+        include_pull_requests: bool = False,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Issues newest first, filtered by state, label name, author and creation date range."""
+        clauses, params = [], []
+        if not include_pull_requests:
+            clauses.append("is_pull_request = 0")
+        if state and state != "all":
+            clauses.append("state = ?")
+            params.append(state)
+        if label:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM json_each(issues.labels) WHERE json_extract(value, '$.name') = ? COLLATE NOCASE)"
+            )
+            params.append(label)
+        if author:
+            clauses.append("author_login = ? COLLATE NOCASE")
+            params.append(author)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("created_at <= ?")
+            params.append(until)
+        sql = "SELECT * FROM issues" + self._where(clauses) + " ORDER BY created_at DESC"
+        rows = self._fetch(sql, params, limit)
+        for row in rows:
+            row["labels"] = json.loads(row["labels"])
+        return rows
+
+    def top_committers(self, since: str = "", until: str = "", limit: int = 10) -> list[dict]:
+        """Commit counts per author in a committer date range, busiest first."""
+        clauses, params = [], []
+        if since:
+            clauses.append("committed_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("committed_at <= ?")
+            params.append(until)
+        sql = (
+            "SELECT COALESCE(author_login, author_name) AS author, COUNT(*) AS commits FROM commits"
+            + self._where(clauses)
+            + " GROUP BY COALESCE(author_login, author_name) ORDER BY commits DESC"
+        )
+        return self._fetch(sql, params, limit)
+
+    def get_commits(self, shas: list[str]) -> dict[str, dict]:
+        placeholders = ", ".join("?" * len(shas))
+        rows = self._fetch(f"SELECT * FROM commits WHERE sha IN ({placeholders})", shas, None)
+        return {row["sha"]: row for row in rows}
+
+    def get_issues(self, numbers: list[int]) -> dict[int, dict]:
+        placeholders = ", ".join("?" * len(numbers))
+        rows = self._fetch(f"SELECT * FROM issues WHERE number IN ({placeholders})", numbers, None)
+        for row in rows:
+            row["labels"] = json.loads(row["labels"])
+        return {row["number"]: row for row in rows}
+
+    @staticmethod
+    def _where(clauses: list[str]) -> str:
+        return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+    def _fetch(self, sql: str, params: list, limit: int | None) -> list[dict]:
+        if limit:
+            sql += " LIMIT ?"
+            params = [*params, limit]
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    # endregion
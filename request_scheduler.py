@@ -0,0 +1,200 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Rate-limit-aware scheduling of GitHub API requests."""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+
+_RETRYABLE_STATUS = {500, 502, 503, 504}
+
+
+class RateLimitExceeded(Exception):
+    """Raised when the primary rate limit resets later than the scheduler is willing to wait."""
+
+    def __init__(self, reset_at: float):
+        super().__init__(f"GitHub rate limit exhausted until {time.strftime('%H:%M:%S', time.localtime(reset_at))}")
+        self.reset_at = reset_at
+
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    paced_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "paced_seconds": round(self.paced_seconds, 3),
+        }
+
+
+class RequestScheduler:
+    """
+    Bounds in-flight requests for one token and paces them against GitHub's rate limits.
+
+    The scheduler reads ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` from every response.
+    While the remaining budget is above ``reserve`` requests go out immediately; below it they
+    are spread evenly over the time left until the reset. Requests already admitted but not yet
+    answered count against the budget, so concurrent callers never pace from a stale value.
+    Responses carrying ``Retry-After`` (secondary limits) pause every caller until the deadline,
+    and 5xx / throttling responses are retried with full-jitter exponential backoff. No wait is
+    ever longer than ``max_wait``: a request that would have to wait longer raises
+    :class:`RateLimitExceeded` instead.
+    """
+
+    sleep: Callable[[float], Awaitable[None]] = staticmethod(asyncio.sleep)
+    clock: Callable[[], float] = staticmethod(time.time)
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30,
+        reserve: int = 50,
+        max_wait: float = 60,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.stats = SchedulerStats()
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self._blocked_until = 0.0
+        self._next_slot = 0.0
+        # Requests admitted by _wait_for_budget whose response has not been observed yet.
+        self._queued = 0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+    def rate_limit(self) -> dict:
+        """Last observed rate-limit headroom."""
+        return {"limit": self.limit, "remaining": self.remaining, "reset_at": self.reset_at}
+
+    async def send(
+        self, request: Callable[[], Awaitable[httpx.Response]], idempotent: bool = True
+    ) -> httpx.Response:
+        """
+        Run ``request`` under the concurrency cap, retrying throttled and failed attempts.
+
+        Args:
+            request: Zero-argument callable issuing the HTTP request.
+            idempotent: Whether 5xx responses may be retried. Throttled requests are always
+                retried because GitHub rejects them before doing any work.
+        """
+        attempt = 0
+        while True:
+            await self._wait_for_budget()
+            try:
+                async with self._get_semaphore():
+                    self.stats.requests += 1
+                    response = await request()
+                self.observe(response)
+            finally:
+                self._queued -= 1
+
+            throttled = self._is_throttled(response)
+            if throttled:
+                self.stats.throttled += 1
+            retryable = throttled or (idempotent and response.status_code in _RETRYABLE_STATUS)
+            if not retryable or attempt >= self.max_retries:
+                return response
+
+            delay = self._backoff(attempt)
+            retry_after = self._retry_after(response)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+                self._blocked_until = max(self._blocked_until, self.clock() + retry_after)
+            elif throttled and self.remaining == 0 and self.reset_at is not None:
+                delay = max(delay, self.reset_at - self.clock())
+            if delay > self.max_wait:
+                return response
+            attempt += 1
+            self.stats.retries += 1
+            await self.sleep(delay)
+
+    def observe(self, response: httpx.Response) -> None:
+        """Record the rate-limit headers of a response."""
+        headers = response.headers
+        # GraphQL and search have their own budgets; pacing follows the core REST budget.
+        if headers.get("X-RateLimit-Resource", "core") != "core":
+            return
+        try:
+            if "X-RateLimit-Limit" in headers:
+                self.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset" in headers:
+                self.reset_at = float(headers["X-RateLimit-Reset"])
+        except ValueError:
+            pass
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _wait_for_budget(self) -> None:
+        now = self.clock()
+        delay = max(0.0, self._blocked_until - now)
+        if delay > self.max_wait:
+            raise RateLimitExceeded(self._blocked_until)
+        if self.remaining is not None and self.reset_at is not None and self.reset_at > now:
+            budget = self.remaining - self._queued
+            if budget <= 0:
+                delay = max(delay, self.reset_at - now)
+                if delay > self.max_wait:
+                    raise RateLimitExceeded(self.reset_at)
+            elif budget < self.reserve:
+                # Reserve a slot so concurrent callers queue up behind each other.
+                interval = (self.reset_at - now) / budget
+                slot = max(now + delay, self._next_slot)
+                if slot - now > self.max_wait:
+                    raise RateLimitExceeded(self.reset_at)
+                self._next_slot = slot + interval
+                delay = slot - now
+        self._queued += 1
+        if delay > 0:
+            self.stats.paced_seconds += delay
+            try:
+                await self.sleep(delay)
+            except BaseException:
+                self._queued -= 1
+                raise
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _is_throttled(self, response: httpx.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        if "Retry-After" in response.headers or response.headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        return "secondary rate limit" in response.text.lower()
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> float | None:
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
@@ -0,0 +1,259 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Conditional-request (ETag / Last-Modified) response cache used by GitHubPlugin."""
+
+import fnmatch
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    link: str | None = None
+    stored_at: float = field(default_factory=time.time)
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def validators(self) -> dict[str, str]:
+        """Headers that turn the next GET into a conditional request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses + self.revalidations
+        return (self.hits + self.revalidations) / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class MemoryCache:
+    """LRU tier bounded by entry count and total body size."""
+
+    def __init__(self, max_entries: int, max_bytes: int, stats: CacheStats):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = stats
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.body)
+            self._entries[key] = entry
+            self._size += len(entry.body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= len(entry.body)
+
+    def expire(self, pattern: str) -> int:
+        with self._lock:
+            stale = [entry for key, entry in self._entries.items() if fnmatch.fnmatchcase(key.lower(), pattern)]
+            for entry in stale:
+                entry.stored_at = 0
+            return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    On-disk tier; WAL mode lets several Streamlit worker processes share one file.
+
+    Bounded like the memory tier: entries not stored or revalidated for ``max_age`` seconds are
+    deleted, then the least recently stored ones until the bodies fit in ``max_bytes``. Pruning
+    runs on open and every ``PRUNE_EVERY`` writes.
+    """
+
+    PRUNE_EVERY = 64
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float = 7 * 24 * 3600,
+        stats: CacheStats | None = None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = stats or CacheStats()
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, link TEXT, stored_at REAL NOT NULL, "
+            "body BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+        self.prune()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, link, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(body=row[0], etag=row[1], last_modified=row[2], link=row[3], stored_at=row[4])
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, link, stored_at, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.etag, entry.last_modified, entry.link, entry.stored_at, entry.body),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def expire(self, pattern: str) -> int:
+        with self._lock:
+            return self._conn.execute("UPDATE responses SET stored_at = 0 WHERE lower(key) GLOB ?", (pattern,)).rowcount
+
+    def prune(self) -> int:
+        """Delete entries over the age and size bounds; returns the number deleted."""
+        with self._lock:
+            return self._prune()
+
+    def _prune(self) -> int:
+        deleted = self._conn.execute(
+            "DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age,)
+        ).rowcount
+        # Keep the most recently stored entries whose bodies add up to at most max_bytes.
+        deleted += self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(length(body)) OVER (ORDER BY stored_at DESC, key) AS size "
+            "FROM responses) WHERE size > ?)",
+            (self.max_bytes,),
+        ).rowcount
+        self.stats.evictions += deleted
+        return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of GET response bodies and their validators.
+
+    Entries younger than ``ttl`` are served without touching the network. Older entries are
+    kept so the next request can be sent with ``If-None-Match`` / ``If-Modified-Since``; a
+    ``304 Not Modified`` answer (which GitHub does not count against the rate limit) refreshes them.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        max_entries: int = 512,
+        max_bytes: int = 32 * 1024 * 1024,
+        path: str | None = None,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+        disk_max_age: float = 7 * 24 * 3600,
+    ):
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.memory = MemoryCache(max_entries, max_bytes, self.stats)
+        self.disk = SQLiteCache(path, disk_max_bytes, disk_max_age, self.stats) if path else None
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.put(key, entry)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        self.stats.stores += 1
+        self.memory.put(key, entry)
+        if self.disk is not None:
+            self.disk.put(key, entry)
+
+    def touch(self, key: str, entry: CachedResponse) -> CachedResponse:
+        """Mark an entry as revalidated by a 304 response."""
+        refreshed = CachedResponse(
+            body=entry.body, etag=entry.etag, last_modified=entry.last_modified, link=entry.link
+        )
+        self.memory.put(key, refreshed)
+        if self.disk is not None:
+            self.disk.put(key, refreshed)
+        return refreshed
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def expire(self, pattern: str) -> int:
+        """
+        Mark every entry whose lower-cased key matches the glob ``pattern`` as stale, so its next
+        read is a conditional request. Returns the number of entries expired.
+        """
+        pattern = pattern.lower()
+        expired = self.memory.expire(pattern)
+        if self.disk is not None:
+            expired = max(expired, self.disk.expire(pattern))
+        return expired
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
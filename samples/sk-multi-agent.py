@@ -1,9 +1,9 @@
 from semantic_kernel import Kernel
-from semantic_kernel.agents import ChatCompletionAgent
-from semantic_kernel.functions.kernel_arguments import KernelArguments
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 from dotenv import load_dotenv
+import asyncio
 import os
+import sys
 
 if os.path.exists(".env"):
     load_dotenv(override=True)
@@ -13,7 +13,12 @@ else:
     env_path = os.path.join(current_dir, '..', '.env')
     load_dotenv(dotenv_path=env_path)
 
-# Initialize the Kernel
+# The router and the GitHub plugin live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from agent_router import AgentRouter
+from git_plugin import GitHubPlugin, GitHubSettings
+
+# Initialize the Kernel, shared by all agents
 kernel = Kernel()
 
 # Add Azure OpenAI Chat Completion Service
@@ -26,30 +31,29 @@ chat_service = AzureChatCompletion(
 )
 kernel.add_service(chat_service)
 
-# Define Agent 1
-agent1 = ChatCompletionAgent(
-    kernel=kernel,
-    name="Agent1",
-    instructions="You are an assistant for general queries.",
-    arguments=KernelArguments()
-)
+# Add the GitHub plugin; each specialist agent may only call its own subset of its functions
+plugin = GitHubPlugin(GitHubSettings(token=os.getenv("GITHUB_PAT")))
+kernel.add_plugin(plugin=plugin, plugin_name="GithubPlugin")
 
-# Define Agent 2
-agent2 = ChatCompletionAgent(
-    kernel=kernel,
-    name="Agent2",
-    instructions="You are an assistant specialized in GitHub-related queries.",
-    arguments=KernelArguments()
-)
+# The router plans which specialists (issues, commits, repository) a question needs,
+# runs them concurrently and merges their answers
+router = AgentRouter(kernel, "chat-service", max_concurrency=4)
 
 # Example Usage
 async def main():
-    response1 = await agent1.get_response("What is the weather today?")
-    print(f"Agent1: {response1.content}")
-
-    response2 = await agent2.get_response("List the issues in the repository.")
-    print(f"Agent2: {response2.content}")
+    await plugin.start()
+    try:
+        answer, report = await router.answer(
+            "How many open bugs does microsoft/semantic-kernel have, who committed most this month "
+            "and what is the repository's description?",
+            context="The repository name: microsoft/semantic-kernel",
+        )
+        print(answer)
+        for branch in report.branches:
+            print(f"{branch.specialist}: {branch.duration_ms / 1000:.1f}s {branch.error}")
+        print(report.summary())
+    finally:
+        await plugin.aclose()
 
 # Run the agents
-import asyncio
 asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,187 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""Local lexical search over issue and commit text with hashed TF-IDF vectors."""
+
+import os
+import shutil
+import threading
+import uuid
+
+import numpy as np
+from scipy import sparse
+
+N_FEATURES = 2**18
+
+_ARRAYS = ("data", "indices", "indptr", "alive", "keys")
+
+
+class SearchIndex:
+    """
+    Cosine top-k search over hashed, sublinear TF-IDF vectors.
+
+    Documents are hashed with scikit-learn's ``HashingVectorizer``, so adding documents never
+    refits a vocabulary. Term frequencies are stored as a CSR matrix and document frequencies
+    are updated incrementally; IDF weights are applied at query time, which keeps scores exact
+    as the corpus grows. Re-adding a key tombstones its previous row.
+
+    On disk each version is a directory of ``.npy`` arrays loaded with ``mmap_mode="r"``;
+    ``CURRENT`` names the live version and is swapped atomically, so readers in other processes
+    never see a half-written index. Tombstoned rows are dropped whenever a version is written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._vectorizer = None
+        self._load()
+
+    @classmethod
+    def open(cls, index_dir: str, organization: str, repo: str, kind: str) -> "SearchIndex":
+        return cls(os.path.join(index_dir, f"{organization}__{repo}.search".lower(), kind))
+
+    # region Storage
+
+    def _load(self) -> None:
+        version = None
+        current = os.path.join(self.path, "CURRENT")
+        for _ in range(3):
+            if not os.path.exists(current):
+                break
+            with open(current) as f:
+                version = f.read().strip()
+            folder = os.path.join(self.path, version)
+            try:
+                arrays = {name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+                self.df = np.load(os.path.join(folder, "df.npy"))
+                break
+            except FileNotFoundError:
+                # Another process replaced this version between reading CURRENT and opening it.
+                version = None
+        if not version:
+            arrays = {
+                "data": np.zeros(0, dtype=np.float32),
+                "indices": np.zeros(0, dtype=np.int32),
+                "indptr": np.zeros(1, dtype=np.int64),
+                "alive": np.zeros(0, dtype=bool),
+                "keys": np.zeros(0, dtype="<U64"),
+            }
+            self.df = np.zeros(N_FEATURES, dtype=np.int64)
+        self.version = version
+        self.data, self.indices, self.indptr = arrays["data"], arrays["indices"], arrays["indptr"]
+        self.alive, self.keys = np.asarray(arrays["alive"]).copy(), arrays["keys"]
+        self._rows = {key: row for row, key in enumerate(self.keys.tolist()) if self.alive[row]}
+
+    def save(self) -> None:
+        """Write a new version of the index, without tombstoned rows, and make it current."""
+        with self._lock:
+            self._compact()
+            os.makedirs(self.path, exist_ok=True)
+            version = uuid.uuid4().hex
+            folder = os.path.join(self.path, version)
+            os.makedirs(folder)
+            for name in _ARRAYS:
+                np.save(os.path.join(folder, f"{name}.npy"), np.asarray(getattr(self, name)))
+            np.save(os.path.join(folder, "df.npy"), self.df)
+            tmp = os.path.join(self.path, f"CURRENT.{version}")
+            with open(tmp, "w") as f:
+                f.write(version)
+            os.replace(tmp, os.path.join(self.path, "CURRENT"))
+            previous, self.version = self.version, version
+            if previous:
+                # Readers that already mapped the old files keep them until they reload.
+                shutil.rmtree(os.path.join(self.path, previous), ignore_errors=True)
+            # Reloaded under the lock so a document added meanwhile (e.g. while saving in a thread) is not lost.
+            self._load()
+
+    def _compact(self) -> None:
+        """Drop tombstoned rows; document frequencies already exclude them."""
+        if self.alive.all():
+            return
+        live = np.flatnonzero(self.alive)
+        documents = sparse.csr_matrix((self.data, self.indices, self.indptr), shape=(len(self.keys), N_FEATURES))
+        kept = documents[live]
+        self.data = kept.data.astype(np.float32)
+        self.indices = kept.indices.astype(np.int32)
+        self.indptr = kept.indptr.astype(np.int64)
+        self.keys = np.asarray(self.keys)[live]
+        self.alive = np.ones(len(live), dtype=bool)
+        self._rows = {key: row for row, key in enumerate(self.keys.tolist())}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # endregion
+
+    def _vectorize(self, texts: list[str]) -> sparse.csr_matrix:
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+
+            self._vectorizer = HashingVectorizer(
+                n_features=N_FEATURES, alternate_sign=False, norm=None, stop_words="english", dtype=np.float32
+            )
+        matrix = self._vectorizer.transform(texts).tocsr()
+        matrix.sum_duplicates()
+        matrix.data = 1 + np.log(matrix.data)
+        return matrix
+
+    def add(self, keys: list[str], texts: list[str]) -> None:
+        """Add or replace documents; call :meth:`save` to persist them."""
+        if not keys:
+            return
+        # A key given more than once keeps its last text; earlier copies would be live rows no key points to.
+        latest = dict(zip(keys, texts))
+        keys, texts = list(latest), list(latest.values())
+        matrix = self._vectorize(texts)
+        with self._lock:
+            alive = self.alive
+            for key in keys:
+                row = self._rows.pop(key, None)
+                if row is not None:
+                    alive[row] = False
+                    start, end = self.indptr[row], self.indptr[row + 1]
+                    np.subtract.at(self.df, np.asarray(self.indices[start:end]), 1)
+            np.add.at(self.df, matrix.indices, 1)
+            offset = len(self.keys)
+            self.data = np.concatenate([self.data, matrix.data.astype(np.float32)])
+            self.indices = np.concatenate([self.indices, matrix.indices.astype(np.int32)])
+            self.indptr = np.concatenate([self.indptr, self.indptr[-1] + matrix.indptr[1:].astype(np.int64)])
+            self.alive = np.concatenate([alive, np.ones(len(keys), dtype=bool)])
+            self.keys = np.concatenate([self.keys, np.asarray(keys, dtype="<U64")])
+            for row, key in enumerate(keys, start=offset):
+                self._rows[key] = row
+
+    def remove(self, keys: list[str]) -> None:
+        """Tombstone documents; call :meth:`save` to persist."""
+        with self._lock:
+            for key in keys:
+                row = self._rows.pop(key, None)
+                if row is not None:
+                    self.alive[row] = False
+                    start, end = self.indptr[row], self.indptr[row + 1]
+                    np.subtract.at(self.df, np.asarray(self.indices[start:end]), 1)
+
+    def search(self, query: str, k: int = 5) -> list[tuple[str, float]]:
+        """Return up to ``k`` ``(key, score)`` pairs by descending cosine similarity."""
+        # A consistent snapshot: save() may be replacing the arrays in another thread.
+        with self._lock:
+            data, indices, indptr, keys, alive = self.data, self.indices, self.indptr, self.keys, self.alive
+            df, count = self.df, len(self._rows)
+        if not count or not query.strip():
+            return []
+        idf = (np.log((1 + count) / (1 + df)) + 1).astype(np.float32)
+        query_vector = self._vectorize([query]).multiply(idf).tocsr()
+        query_norm = float(np.sqrt(query_vector.multiply(query_vector).sum()))
+        if query_norm == 0:
+            return []
+        documents = sparse.csr_matrix((data, indices, indptr), shape=(len(keys), N_FEATURES))
+        weights = idf * idf
+        scores = np.asarray(documents @ query_vector.multiply(idf).T.toarray()).ravel()
+        norms = np.sqrt(np.asarray(documents.multiply(documents) @ weights).ravel())
+        scores = np.divide(scores, norms * query_norm, out=np.zeros_like(scores), where=norms > 0)
+        scores[~alive] = 0
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(str(keys[row]), float(scores[row])) for row in top]
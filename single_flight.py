@@ -0,0 +1,59 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""In-flight deduplication of identical concurrent requests."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlencode
+
+import httpx
+
+
+def request_key(method: str, path: str) -> str:
+    """Normalize a request to ``METHOD /path?sorted-query`` so equivalent calls share a key."""
+    url = httpx.URL(path)
+    query = urlencode(sorted(url.params.multi_items()))
+    return f"{method.upper()} {url.path}?{query}" if query else f"{method.upper()} {url.path}"
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+class SingleFlight:
+    """
+    Runs at most one upstream call per key at a time.
+
+    Callers arriving while a call for the same key is running await that call instead of
+    starting their own. A caller being cancelled does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._inflight: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        slot = (asyncio.get_running_loop(), key)
+        task = self._inflight.get(slot)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.calls += 1
+            task = asyncio.ensure_future(call())
+            self._inflight[slot] = task
+            task.add_done_callback(lambda done: self._finish(slot, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, slot: tuple[asyncio.AbstractEventLoop, str], task: asyncio.Task) -> None:
+        if self._inflight.get(slot) is task:
+            del self._inflight[slot]
+        # Mark the exception as retrieved in case every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,263 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""OpenTelemetry spans for GitHub requests, tool calls and agent turns, with Prometheus-style metrics."""
+
+import bisect
+import logging
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("git_dev_agent")
+
+# Span names and attributes set by this app; Semantic Kernel's own spans follow the GenAI
+# semantic conventions ("gen_ai.operation.name" of "execute_tool", "chat" and "invoke_agent").
+GITHUB_REQUEST_SPAN = "github.request"
+TURN_SPAN = "agent.turn"
+CACHE_OUTCOME = "github.cache"
+RESPONSE_BYTES = "github.response.bytes"
+RATE_LIMIT_REMAINING = "github.rate_limit.remaining"
+
+_OPERATION = "gen_ai.operation.name"
+_TOOL_NAME = "gen_ai.tool.name"
+_MODEL = "gen_ai.request.model"
+_INPUT_TOKENS = "gen_ai.usage.input_tokens"
+_OUTPUT_TOKENS = "gen_ai.usage.output_tokens"
+
+# Upper bounds of the latency histogram buckets, in seconds.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class WaterfallRow:
+    """One span of a turn, positioned relative to the start of the turn."""
+
+    name: str
+    start_ms: float
+    duration_ms: float
+    depth: int
+    attributes: dict = field(default_factory=dict)
+
+
+class Metrics:
+    """Counters and latency histograms derived from finished spans, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, tuple], float] = defaultdict(float)
+        self._gauges: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], list] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        with self._lock:
+            # [per-bucket counts, sum, count]
+            histogram = self._histograms.setdefault(
+                (name, tuple(sorted(labels.items()))), [[0] * len(DURATION_BUCKETS), 0.0, 0]
+            )
+            index = bisect.bisect_left(DURATION_BUCKETS, seconds)
+            if index < len(DURATION_BUCKETS):
+                histogram[0][index] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def record_span(self, span: ReadableSpan) -> None:
+        attributes = span.attributes or {}
+        seconds = (span.end_time - span.start_time) / 1e9
+        operation = attributes.get(_OPERATION)
+        if span.name == GITHUB_REQUEST_SPAN:
+            labels = {
+                "method": attributes.get("http.request.method", ""),
+                "status": str(attributes.get("http.response.status_code", "")),
+                "cache": attributes.get(CACHE_OUTCOME, ""),
+            }
+            self.observe("github_request_duration_seconds", seconds, **labels)
+            self.inc("github_response_bytes_total", attributes.get(RESPONSE_BYTES, 0), cache=labels["cache"])
+            if RATE_LIMIT_REMAINING in attributes:
+                self.set("github_rate_limit_remaining", attributes[RATE_LIMIT_REMAINING])
+        elif operation == "execute_tool":
+            self.observe("kernel_function_duration_seconds", seconds, function=attributes.get(_TOOL_NAME, ""))
+        elif operation == "chat":
+            model = attributes.get(_MODEL, "")
+            self.observe("llm_request_duration_seconds", seconds, model=model)
+            self.inc("llm_tokens_total", attributes.get(_INPUT_TOKENS, 0), model=model, kind="input")
+            self.inc("llm_tokens_total", attributes.get(_OUTPUT_TOKENS, 0), model=model, kind="output")
+        elif span.name == TURN_SPAN:
+            self.observe("agent_turn_duration_seconds", seconds)
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric."""
+        lines = []
+        with self._lock:
+            for kind, series in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted({name for name, _ in series}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    lines += [f"{name}{_labels(labels)} {value:g}" for (n, labels), value in series.items() if n == name]
+            for name in sorted({name for name, _ in self._histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (n, labels), (buckets, total, count) in self._histograms.items():
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket in zip(DURATION_BUCKETS, buckets):
+                        cumulative += bucket
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {total:g}")
+                    lines.append(f"{name}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class TurnCollector(SpanProcessor):
+    """
+    Span processor that feeds :class:`Metrics` and keeps the spans of the traces being watched,
+    so the caller can build a waterfall of one agent turn once it has finished.
+    """
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._traces: dict[int, list[ReadableSpan]] = {}
+
+    def watch(self, trace_id: int) -> None:
+        with self._lock:
+            self._traces[trace_id] = []
+
+    def unwatch(self, trace_id: int) -> None:
+        """Stop watching a trace and drop its spans, e.g. when the turn failed before its waterfall."""
+        with self._lock:
+            self._traces.pop(trace_id, None)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        self.metrics.record_span(span)
+        with self._lock:
+            spans = self._traces.get(span.context.trace_id)
+            if spans is not None:
+                spans.append(span)
+
+    def waterfall(self, trace_id: int) -> list[WaterfallRow]:
+        """Stop watching a trace and return its finished spans in start order."""
+        with self._lock:
+            spans = self._traces.pop(trace_id, [])
+        if not spans:
+            return []
+        spans.sort(key=lambda span: span.start_time)
+        parents = {span.context.span_id: span.parent.span_id if span.parent else None for span in spans}
+        origin = spans[0].start_time
+
+        def depth(span_id: int | None) -> int:
+            level = 0
+            while (span_id := parents.get(span_id)) is not None:
+                level += 1
+            return level
+
+        return [
+            WaterfallRow(
+                name=span.name,
+                start_ms=(span.start_time - origin) / 1e6,
+                duration_ms=(span.end_time - span.start_time) / 1e6,
+                depth=depth(span.context.span_id),
+                attributes=dict(span.attributes or {}),
+            )
+            for span in spans
+        ]
+
+
+def turn_usage(rows: list[WaterfallRow]) -> dict:
+    """Chat completion calls and token counts of one turn's waterfall."""
+    chats = [row for row in rows if row.attributes.get(_OPERATION) == "chat"]
+    return {
+        "llm_calls": len(chats),
+        "llm_ms": sum(row.duration_ms for row in chats),
+        "input_tokens": sum(row.attributes.get(_INPUT_TOKENS, 0) for row in chats),
+        "output_tokens": sum(row.attributes.get(_OUTPUT_TOKENS, 0) for row in chats),
+    }
+
+
+def format_waterfall(rows: list[WaterfallRow], width: int = 40) -> str:
+    """Render a waterfall as fixed-width text, one span per line."""
+    if not rows:
+        return ""
+    total = max(row.start_ms + row.duration_ms for row in rows) or 1.0
+    label_width = max(2 * row.depth + len(row.name) for row in rows)
+    lines = []
+    for row in rows:
+        start = int(row.start_ms / total * width)
+        length = max(1, round(row.duration_ms / total * width))
+        bar = " " * start + "█" * min(length, width - start)
+        label = "  " * row.depth + row.name
+        lines.append(f"{label:<{label_width}} |{bar:<{width}}| {row.start_ms:8.1f} +{row.duration_ms:8.1f} ms")
+    return "\n".join(lines)
+
+
+def configure_telemetry(console: bool = False) -> TurnCollector:
+    """
+    Install a tracer provider with a :class:`TurnCollector`.
+
+    Spans are also exported over OTLP when ``OTEL_EXPORTER_OTLP_ENDPOINT`` is set and the
+    optional ``opentelemetry-exporter-otlp`` package is installed, and to stdout if ``console``.
+    """
+    collector = TurnCollector(Metrics())
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    provider.add_span_processor(collector)
+    if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-exporter-otlp is not installed")
+        else:
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    if console:
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    return collector
+
+
+def serve_metrics(metrics: Metrics, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` in the Prometheus text format from a daemon thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
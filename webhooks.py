@@ -0,0 +1,342 @@
+# Copyright (c) Microsoft. All rights reserved.
+
+"""
+GitHub webhook receiver that keeps GitHubPlugin's response cache and local indexes current.
+
+Recorded deliveries can be replayed against a running receiver, or applied to the local
+indexes directly:
+
+    python webhooks.py replay deliveries/*.json --url http://127.0.0.1:8787/webhook --secret $SECRET
+    python webhooks.py replay deliveries/*.json --index-dir .github-index
+
+A recorded delivery is a JSON file ``{"event": "issues", "delivery": "<id>", "payload": {...}}``.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from git_plugin import GitHubPlugin, GitHubSettings
+from search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+def sign(secret: str, body: bytes) -> str:
+    """The ``X-Hub-Signature-256`` header GitHub sends for ``body``."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    return bool(signature) and hmac.compare_digest(sign(secret, body), signature)
+
+
+def pull_request_as_issue(pull_request: dict) -> dict:
+    """The issues-API representation of a pull request, as stored in the local index."""
+    return {
+        "id": pull_request["id"],
+        "number": pull_request["number"],
+        "html_url": pull_request["html_url"],
+        "title": pull_request["title"],
+        "state": pull_request["state"],
+        "user": pull_request.get("user"),
+        "labels": pull_request.get("labels", []),
+        "created_at": pull_request.get("created_at"),
+        "updated_at": pull_request.get("updated_at"),
+        "closed_at": pull_request.get("closed_at"),
+        "body": pull_request.get("body"),
+        "pull_request": {"url": pull_request.get("url"), "merged_at": pull_request.get("merged_at")},
+    }
+
+
+def push_commit_as_rest(commit: dict) -> dict:
+    """The commits-API shape of a commit listed in a push event."""
+    author, committer = commit["author"], commit.get("committer") or commit["author"]
+    return {
+        "sha": commit["id"],
+        "author": {"login": author.get("username")} if author.get("username") else None,
+        "commit": {
+            "author": {"name": author.get("name"), "email": author.get("email"), "date": commit["timestamp"]},
+            "committer": {"name": committer.get("name"), "email": committer.get("email"), "date": commit["timestamp"]},
+            "message": commit["message"],
+        },
+    }
+
+
+class WebhookProcessor:
+    """
+    Applies webhook events to a plugin.
+
+    Single resources carried by an event (an issue) are patched into the response cache, list
+    and summary responses it affects are expired so their next read is a conditional request,
+    and the local SQLite and search indexes are updated in place. The first event of a
+    repository puts it under webhook coverage (see ``GitHubPlugin.cover_repository``); an event
+    that cannot be applied removes it, so reads fall back to revalidation.
+
+    Search index changes are searchable at once, but written to disk at most every
+    ``save_delay`` seconds, in a worker thread, so a burst of deliveries costs one rewrite.
+    """
+
+    def __init__(self, plugin: GitHubPlugin, save_delay: float = 5.0):
+        self.plugin = plugin
+        self.save_delay = save_delay
+        self._unsaved: dict[str, SearchIndex] = {}
+        self._save_task: asyncio.Task | None = None
+
+    async def apply(self, event: str, payload: dict) -> list[str]:
+        """Apply one delivery and return a short description of each change made."""
+        repository = payload.get("repository")
+        if not repository:
+            return []
+        full_name = repository["full_name"]
+        try:
+            handler = getattr(self, f"_on_{event}", None)
+            if handler is None:
+                # Unknown events may still change what the API returns: revalidate the repository.
+                changes = [f"expired {self._expire(full_name, '', '/*')} responses"]
+            else:
+                changes = await handler(full_name, payload)
+        except Exception:
+            self.plugin.uncover_repository(full_name)
+            raise
+        self.plugin.cover_repository(full_name)
+        return changes
+
+    async def flush(self) -> None:
+        """Write the search indexes changed since the last save."""
+        while self._unsaved:
+            _, search = self._unsaved.popitem()
+            await asyncio.to_thread(search.save)
+
+    def _save_soon(self, search: SearchIndex) -> None:
+        self._unsaved[search.path] = search
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.ensure_future(self._save_after_delay())
+
+    async def _save_after_delay(self) -> None:
+        await asyncio.sleep(self.save_delay)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to save search indexes")
+
+    async def _on_ping(self, full_name: str, payload: dict) -> list[str]:
+        return ["coverage started"]
+
+    async def _on_issues(self, full_name: str, payload: dict) -> list[str]:
+        issue = payload["issue"]
+        number = issue["number"]
+        changes = [f"expired {self._expire(full_name, '', '/issues', '/issues[?]*')} responses"]
+        if payload["action"] in ("deleted", "transferred"):
+            self.plugin.expire_cached(f"/repos/{full_name}/issues/{number}")
+            changes.append(f"removed issue #{number}")
+            await self._remove_issue(full_name, number)
+        else:
+            self.plugin.expire_cached(f"/repos/{full_name}/issues/{number}")
+            self.plugin.patch_cached(f"/repos/{full_name}/issues/{number}", issue)
+            changes.append(f"patched issue #{number}")
+            await self._upsert_issue(full_name, issue)
+        return changes
+
+    async def _on_pull_request(self, full_name: str, payload: dict) -> list[str]:
+        issue = pull_request_as_issue(payload["pull_request"])
+        expired = self._expire(full_name, "", "/issues", "/issues[?]*", f"/issues/{issue['number']}", "/pulls*")
+        await self._upsert_issue(full_name, issue)
+        return [f"expired {expired} responses", f"indexed pull request #{issue['number']}"]
+
+    async def _on_label(self, full_name: str, payload: dict) -> list[str]:
+        label, action = payload["label"], payload["action"]
+        old_name = payload.get("changes", {}).get("name", {}).get("from", label["name"])
+        expired = self._expire(full_name, "/issues*", "/labels*")
+        index = self._index(full_name)
+        updated = 0
+        if action in ("edited", "deleted"):
+            async with self._lock(full_name, "issues"):
+                updated = index.update_label(old_name, None if action == "deleted" else label)
+        return [f"expired {expired} responses", f"updated label {old_name!r} on {updated} indexed issues"]
+
+    async def _on_push(self, full_name: str, payload: dict) -> list[str]:
+        expired = self._expire(full_name, "", "/commits", "/commits[?]*", "/compare/*", "/branches*")
+        changes = [f"expired {expired} responses"]
+        default_ref = f"refs/heads/{payload['repository'].get('default_branch')}"
+        if payload.get("ref") != default_ref:
+            return changes
+        organization, repo = full_name.split("/")
+        if payload.get("forced"):
+            # Rewritten history cannot be patched; resync commits from the backfill horizon.
+            self._index(full_name).reset_watermark("commits")
+            return changes + ["reset commit index watermark"]
+        commits = [push_commit_as_rest(commit) for commit in payload.get("commits", []) if commit.get("distinct", True)]
+        if commits:
+            async with self._lock(full_name, "commits"):
+                self._index(full_name).upsert_commits(commits)
+                search = self.plugin.get_search_index(organization, repo, "commits")
+                search.add([c["sha"] for c in commits], [c["commit"]["message"] for c in commits])
+                self._save_soon(search)
+        return changes + [f"indexed {len(commits)} commits"]
+
+    async def _upsert_issue(self, full_name: str, issue: dict) -> None:
+        organization, repo = full_name.split("/")
+        async with self._lock(full_name, "issues"):
+            index = self._index(full_name)
+            existing = index.get_issues([issue["number"]]).get(issue["number"])
+            # Deliveries can arrive out of order; never replace a newer row.
+            if existing and (existing["updated_at"] or "") > (issue.get("updated_at") or ""):
+                return
+            index.upsert_issues([issue])
+            search = self.plugin.get_search_index(organization, repo, "issues")
+            search.add([str(issue["number"])], [f"{issue['title']}\n{issue.get('body') or ''}"])
+            self._save_soon(search)
+
+    async def _remove_issue(self, full_name: str, number: int) -> None:
+        organization, repo = full_name.split("/")
+        async with self._lock(full_name, "issues"):
+            self._index(full_name).delete_issues([number])
+            search = self.plugin.get_search_index(organization, repo, "issues")
+            search.remove([str(number)])
+            self._save_soon(search)
+
+    def _expire(self, full_name: str, *suffixes: str) -> int:
+        return sum(self.plugin.expire_cached(f"/repos/{full_name}{suffix}") for suffix in suffixes)
+
+    def _index(self, full_name: str):
+        return self.plugin.get_index(*full_name.split("/"))
+
+    def _lock(self, full_name: str, resource: str) -> asyncio.Lock:
+        organization, repo = full_name.split("/")
+        return self.plugin.index_lock(organization, repo, resource)
+
+
+class WebhookServer:
+    """
+    Receives ``POST /webhook`` deliveries on a daemon thread, verifies ``X-Hub-Signature-256``
+    and applies them on ``loop`` (the loop the plugin runs on). Redelivered ``X-GitHub-Delivery``
+    ids are acknowledged without being applied twice.
+    """
+
+    def __init__(
+        self,
+        processor: WebhookProcessor,
+        secret: str,
+        loop: asyncio.AbstractEventLoop,
+        host: str = "127.0.0.1",
+        port: int = 8787,
+    ):
+        self.processor = processor
+        self.secret = secret
+        self.loop = loop
+        self._deliveries: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+
+    def start(self) -> "WebhookServer":
+        threading.Thread(target=self.httpd.serve_forever, name="webhook-server", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        try:
+            asyncio.run_coroutine_threadsafe(self.processor.flush(), self.loop).result(timeout=30)
+        except Exception:
+            logger.exception("Failed to save search indexes")
+        # Without a receiver deliveries are missed; stop trusting the cache beyond cache_ttl.
+        self.processor.plugin.uncover_repository()
+
+    def handle(self, headers, body: bytes) -> tuple[int, str]:
+        if not verify_signature(self.secret, body, headers.get("X-Hub-Signature-256")):
+            return 401, "invalid signature"
+        delivery = headers.get("X-GitHub-Delivery") or ""
+        with self._lock:
+            if delivery and delivery in self._deliveries:
+                return 200, "duplicate delivery"
+            self._deliveries[delivery] = None
+            while len(self._deliveries) > 1000:
+                self._deliveries.popitem(last=False)
+        event = headers.get("X-GitHub-Event", "")
+        try:
+            payload = json.loads(body)
+            future = asyncio.run_coroutine_threadsafe(self.processor.apply(event, payload), self.loop)
+            changes = future.result(timeout=30)
+        except Exception:
+            logger.exception("Failed to apply %s delivery %s", event, delivery)
+            # Forget the id so GitHub's redelivery of this delivery is applied.
+            with self._lock:
+                self._deliveries.pop(delivery, None)
+            return 500, "failed"
+        return 200, "; ".join(changes) or "ignored"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path.split("?")[0] != "/webhook":
+                    self.send_error(404)
+                    return
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, message = server.handle(self.headers, body)
+                data = message.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def replay(paths: list[str], url: str | None, secret: str, index_dir: str) -> None:
+    """Send recorded deliveries to a receiver, or apply them to the local indexes without one."""
+    import httpx
+
+    deliveries = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            deliveries.append(json.load(f))
+    if url:
+        with httpx.Client() as client:
+            for delivery in deliveries:
+                body = json.dumps(delivery["payload"]).encode()
+                response = client.post(
+                    url,
+                    content=body,
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-GitHub-Event": delivery["event"],
+                        "X-GitHub-Delivery": delivery.get("delivery") or str(uuid.uuid4()),
+                        "X-Hub-Signature-256": sign(secret, body),
+                    },
+                )
+                print(f"{delivery['event']}: {response.status_code} {response.text}")
+        return
+
+    async def apply_all() -> None:
+        processor = WebhookProcessor(GitHubPlugin(GitHubSettings(token="", index_dir=index_dir)))
+        for delivery in deliveries:
+            changes = await processor.apply(delivery["event"], delivery["payload"])
+            print(f"{delivery['event']}: {'; '.join(changes) or 'ignored'}")
+        await processor.flush()
+
+    asyncio.run(apply_all())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    replay_parser = commands.add_parser("replay", help="replay recorded deliveries")
+    replay_parser.add_argument("paths", nargs="+")
+    replay_parser.add_argument("--url", help="receiver to post to; without it the deliveries are applied locally")
+    replay_parser.add_argument("--secret", default="", help="webhook secret used to sign replayed deliveries")
+    replay_parser.add_argument("--index-dir", default=".github-index")
+    args = parser.parse_args()
+    replay(args.paths, args.url, args.secret, args.index_dir)